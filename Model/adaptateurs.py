@@ -0,0 +1,119 @@
+# Model/adaptateurs.py
+# Interface des sites distributeurs : un adaptateur sait résoudre une
+# référence en URL produit, extraire la fiche et lister ses fichiers.
+# deejay.de est le premier ; un autre distributeur s'ajoute en écrivant sa
+# sous-classe et en l'inscrivant avec enregistrer_adaptateur().
+
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+from Model.commun import INTROUVABLE_SELECTEUR, INTROUVABLE_TEXTE, URL_ACCUEIL
+
+
+class AdaptateurSite(ABC):
+    """
+    Base abstraite des adaptateurs : resoudre et extraire sont à fournir. Les méthodes reçoivent le pilote Chrome du worker
+    (None si navigateur=False) et l'état de session créé par nouvelle_session().
+    Attributs de classe :
+        nom (str): identifiant du site (clé du registre)
+        url_accueil (str): racine du site ; une URL sous cette racine est
+            acceptée telle quelle comme référence
+        navigateur (bool): le site a besoin d'un Chrome
+        debit (float): requêtes/s autorisées sur le site (seau à jetons)
+        rafale (int): requêtes consécutives autorisées avant limitation
+        nb_pilotes (int): Chrome (ou workers) dédiés au site
+        introuvable_selecteur / introuvable_texte (str): marqueur de la page
+            « aucun résultat » ; sans lui, une recherche vide attend le délai
+    """
+
+    nom = None
+    url_accueil = None
+    navigateur = True
+    debit = 1.0
+    rafale = 2
+    nb_pilotes = 1
+    introuvable_selecteur = None
+    introuvable_texte = None
+
+    def nouvelle_session(self):
+        """État propre à un pilote (cookies, gabarit d'URL...) ; None par défaut."""
+        return None
+
+    def accepte_url(self, texte):
+        """Vrai si texte est une URL produit de ce site (pas de recherche à faire)."""
+        return bool(self.url_accueil) and urlsplit(texte).netloc == urlsplit(self.url_accueil).netloc
+
+    @abstractmethod
+    def resoudre(self, driver, ref, session=None):
+        """Returns: URL produit de ref, ou None si le site ne l'a pas"""
+
+    @abstractmethod
+    def extraire(self, driver, product_url, ref, telechargements=None, session=None):
+        """
+        Returns:
+            dict: fiche au format de scrap.extract_main_product_details
+            (artist, title, price, tracks, description, url, assets...), ou None
+        """
+
+    def lister_assets(self, details):
+        """Returns: list of dict (type, url, fichier) à télécharger pour la fiche"""
+        return list(details.get('assets', [])) if details else []
+
+
+class AdaptateurDeejay(AdaptateurSite):
+    """deejay.de, via les fonctions Selenium de Model.scrap."""
+
+    nom = 'deejay'
+    url_accueil = URL_ACCUEIL
+    debit = 2.0
+    rafale = 4
+    nb_pilotes = 2
+    introuvable_selecteur = INTROUVABLE_SELECTEUR
+    introuvable_texte = INTROUVABLE_TEXTE
+
+    def nouvelle_session(self):
+        from Model.session_navigateur import EtatSession
+        return EtatSession()
+
+    def resoudre(self, driver, ref, session=None):
+        if self.accepte_url(ref):
+            return ref
+        from Model.attentes import marqueur_absence
+        from Model.scrap import get_first_product_link
+        return get_first_product_link(driver, ref, session,
+                                      marqueur_absence(self.introuvable_selecteur, self.introuvable_texte))
+
+    def extraire(self, driver, product_url, ref, telechargements=None, session=None):
+        from Model.scrap import extract_main_product_details
+        return extract_main_product_details(driver, product_url, ref, telechargements)
+
+
+ADAPTATEURS = {}
+
+
+def enregistrer_adaptateur(classe):
+    """
+    Inscrit une sous-classe d'AdaptateurSite dans le registre (utilisable en décorateur).
+    Raises:
+        TypeError: classe incomplète (méthode abstraite non fournie) ou sans nom
+    """
+    if not (isinstance(classe, type) and issubclass(classe, AdaptateurSite)):
+        raise TypeError(f"{classe!r} n'est pas un AdaptateurSite")
+    if classe.__abstractmethods__:
+        raise TypeError(f"Adaptateur {classe.__name__} incomplet : "
+                        f"{', '.join(sorted(classe.__abstractmethods__))} à fournir")
+    if not classe.nom:
+        raise TypeError(f"Adaptateur {classe.__name__} sans nom")
+    ADAPTATEURS[classe.nom] = classe
+    return classe
+
+
+def creer_adaptateur(nom):
+    """
+    Raises:
+        KeyError: site inconnu
+    """
+    return ADAPTATEURS[nom]()
+
+
+enregistrer_adaptateur(AdaptateurDeejay)
@@ -0,0 +1,161 @@
+# Model/attentes.py
+# Attentes adaptatives à la place des WebDriverWait à budget fixe : le délai
+# de chaque sélecteur est déduit du p99 glissant des latences observées, et
+# la page « aucun résultat » d'un site, reconnue à son marqueur, rend la main
+# tout de suite au lieu d'épuiser le délai.
+
+from collections import deque
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+import json
+import os
+import threading
+import time
+
+
+CHEMIN_ATTENTES = os.path.join(os.getcwd(), ".attentes_deejay.json")
+DELAI_DEFAUT = 3.0  # Budget des anciens WebDriverWait, tant qu'on n'a rien appris
+DELAI_MIN = 0.5
+DELAI_MAX = 15.0
+MARGE = 1.5  # Délai = p99 x MARGE
+TAILLE_FENETRE = 200
+MIN_OBSERVATIONS = 5
+FREQUENCE_SONDAGE = 0.05  # WebDriverWait sonde toutes les 0,5 s par défaut
+
+AUCUN = object()  # Renvoyé quand le marqueur d'absence a été vu
+
+
+def marqueur_absence(selecteur=None, texte=None):
+    """
+    Marqueur d'absence d'un site : sa page « aucun résultat » est affichée,
+    repérée par un élément (sélecteur CSS) ou par un texte. Un document
+    chargé sans l'élément attendu ne suffit pas : il peut encore arriver par JS.
+    Returns:
+        callable: absence(driver) pour AttentesAdaptatives.attendre, ou None
+        si le site n'a pas de marqueur (on attend alors le délai adaptatif)
+    """
+    if not selecteur and not texte:
+        return None
+
+    def absence(driver):
+        if selecteur and driver.find_elements(By.CSS_SELECTOR, selecteur):
+            return True
+        return bool(texte) and texte in driver.execute_script(
+            "return document.body ? document.body.innerText : ''"
+        )
+
+    return absence
+
+
+class AttentesAdaptatives:
+    """
+    Délais appris par sélecteur, partagés par les pilotes et entre exécutions.
+    Un dépassement de délai compte (sauf demande contraire) comme une
+    observation égale au délai : le p99 monte, et une page lente ne fait pas
+    échouer les suivantes.
+    """
+
+    def __init__(self, chemin=CHEMIN_ATTENTES):
+        self.chemin = chemin
+        self._verrou = threading.Lock()
+        self._latences = {}  # cle -> deque des dernières latences (s)
+        self.court_circuits = 0
+        self.depassements = 0
+        try:
+            with open(chemin, encoding='utf-8') as f:
+                for cle, latences in json.load(f).items():
+                    self._latences[cle] = deque(latences, maxlen=TAILLE_FENETRE)
+        except (OSError, ValueError):
+            pass
+
+    def observer(self, cle, latence):
+        with self._verrou:
+            if cle not in self._latences:
+                self._latences[cle] = deque(maxlen=TAILLE_FENETRE)
+            self._latences[cle].append(round(latence, 4))
+
+    def p99(self, cle):
+        with self._verrou:
+            latences = sorted(self._latences.get(cle, ()))
+        if len(latences) < MIN_OBSERVATIONS:
+            return None
+        return latences[min(len(latences) - 1, int(0.99 * len(latences)))]
+
+    def delai(self, cle, defaut=DELAI_DEFAUT):
+        """Délai à accorder : p99 x MARGE borné, ou defaut tant qu'on a trop peu d'observations."""
+        p99 = self.p99(cle)
+        if p99 is None:
+            return defaut
+        return min(DELAI_MAX, max(DELAI_MIN, p99 * MARGE))
+
+    def attendre(self, driver, by, selecteur, cle=None, condition=None, absence=None, defaut=DELAI_DEFAUT,
+                 apprendre_depassement=True):
+        """
+        Attend le premier élément correspondant au sélecteur.
+        Args:
+            cle (str): nom sous lequel la latence est apprise (par défaut le sélecteur)
+            condition (callable): filtre supplémentaire sur l'élément (ex. cliquable)
+            absence (callable): absence(driver) vrai = l'élément ne viendra pas
+                (ex. marqueur_absence de la page « aucun résultat »)
+            defaut (float): délai tant que rien n'est appris
+            apprendre_depassement (bool): False pour un élément souvent
+                absent à bon droit (bannière déjà acceptée)
+        Returns:
+            WebElement, ou AUCUN si le marqueur d'absence a été vu
+        Raises:
+            TimeoutException: délai écoulé
+        """
+        cle = cle or selecteur
+        delai = self.delai(cle, defaut)
+
+        def sonder(d):
+            elements = d.find_elements(by, selecteur)
+            if elements and (condition is None or condition(elements[0])):
+                return elements[0]
+            if absence is not None and absence(d):
+                # Dernière vérification : l'élément a pu arriver avec la fin du chargement
+                elements = d.find_elements(by, selecteur)
+                return elements[0] if elements else AUCUN
+            return False
+
+        debut = time.perf_counter()
+        try:
+            resultat = WebDriverWait(driver, delai, poll_frequency=FREQUENCE_SONDAGE).until(sonder)
+        except TimeoutException:
+            with self._verrou:
+                self.depassements += 1
+            if apprendre_depassement:
+                self.observer(cle, delai)
+            raise
+        if resultat is AUCUN:
+            with self._verrou:
+                self.court_circuits += 1
+        else:
+            self.observer(cle, time.perf_counter() - debut)
+        return resultat
+
+    def valeurs(self):
+        """Valeurs apprises : {cle: {'observations', 'p99', 'delai'}}."""
+        with self._verrou:
+            cles = list(self._latences)
+        return {cle: {'observations': len(self._latences[cle]), 'p99': self.p99(cle), 'delai': round(self.delai(cle), 3)}
+                for cle in cles}
+
+    def sauvegarder(self):
+        with self._verrou:
+            donnees = {cle: list(latences) for cle, latences in self._latences.items()}
+        temporaire = self.chemin + ".tmp"
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(donnees, f)
+        os.replace(temporaire, self.chemin)
+
+    def resume(self):
+        lignes = [f"Attentes adaptatives : {self.court_circuits} court-circuit(s), {self.depassements} dépassement(s)"]
+        for cle, v in sorted(self.valeurs().items()):
+            p99 = f"{v['p99']:.2f} s" if v['p99'] is not None else "n/a"
+            lignes.append(f"  {cle:<28} p99 {p99:>8}  délai {v['delai']:.2f} s  ({v['observations']} obs.)")
+        return "\n".join(lignes)
+
+
+ATTENTES = AttentesAdaptatives()
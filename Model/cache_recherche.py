@@ -0,0 +1,103 @@
+# Model/cache_recherche.py
+# Cache disque référence -> URL produit devant get_first_product_link :
+# TTL, TTL séparé pour les références introuvables, éviction LRU, compteurs.
+
+from collections import OrderedDict
+import json
+import os
+import threading
+import time
+
+from Model.commun import INTROUVABLE_SELECTEUR, INTROUVABLE_TEXTE
+
+
+CHEMIN_CACHE = os.path.join(os.getcwd(), ".cache_recherche.json")
+TTL = 30 * 24 * 3600  # Une URL produit ne change quasiment jamais
+# Une référence introuvable peut apparaître plus tard ; sans marqueur « aucun
+# résultat », une absence peut aussi être une page lente : gardée peu de temps
+TTL_NEGATIF = 24 * 3600 if (INTROUVABLE_SELECTEUR or INTROUVABLE_TEXTE) else 3600
+TAILLE_MAX = 50000
+ECRITURES_AVANT_SAUVEGARDE = 20
+
+
+class CacheRecherche:
+    """Cache persistant partagé par les workers ; sauvegardé toutes les N écritures et à la fin."""
+
+    def __init__(self, chemin=CHEMIN_CACHE, ttl=TTL, ttl_negatif=TTL_NEGATIF, taille_max=TAILLE_MAX):
+        self.chemin = chemin
+        self.ttl = ttl
+        self.ttl_negatif = ttl_negatif
+        self.taille_max = taille_max
+        self.hits = 0
+        self.misses = 0
+        self._verrou = threading.RLock()
+        self._modifs = 0
+        self._entrees = OrderedDict()  # ref -> (url ou None, date), du moins au plus récemment utilisé
+        try:
+            with open(chemin, encoding='utf-8') as f:
+                for ref, url, date in json.load(f):
+                    self._entrees[ref] = (url, date)
+        except (OSError, ValueError):
+            pass
+
+    def lire(self, ref):
+        """
+        Returns:
+            tuple: (present, url) ; present vaut False si absent ou expiré,
+            url vaut None pour une référence connue comme introuvable
+        """
+        with self._verrou:
+            entree = self._entrees.get(ref)
+            if entree is not None:
+                url, date = entree
+                if time.time() - date < (self.ttl if url else self.ttl_negatif):
+                    self._entrees.move_to_end(ref)
+                    self.hits += 1
+                    return True, url
+                del self._entrees[ref]
+            self.misses += 1
+            return False, None
+
+    def ecrire(self, ref, url):
+        with self._verrou:
+            self._entrees[ref] = (url, time.time())
+            self._entrees.move_to_end(ref)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+            self._modifs += 1
+            if self._modifs >= ECRITURES_AVANT_SAUVEGARDE:
+                self.sauvegarder()
+
+    def resoudre(self, ref, recherche):
+        """
+        Renvoie l'URL en cache, sinon appelle recherche(ref) et mémorise le résultat.
+        Si recherche lève (délai dépassé...), rien n'est mémorisé et l'exception remonte.
+        """
+        present, url = self.lire(ref)
+        if present:
+            return url
+        url = recherche(ref)
+        self.ecrire(ref, url)
+        return url
+
+    def sauvegarder(self):
+        with self._verrou:
+            temporaire = self.chemin + ".tmp"
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump([[ref, url, date] for ref, (url, date) in self._entrees.items()], f)
+            os.replace(temporaire, self.chemin)
+            self._modifs = 0
+
+    def statistiques(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'taux': self.hits / total if total else 0.0,
+            'entrees': len(self._entrees),
+        }
+
+    def resume(self):
+        stats = self.statistiques()
+        return (f"Cache recherche : {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['taux']:.0%}), {stats['entrees']} entrées")
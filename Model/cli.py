@@ -0,0 +1,249 @@
+# Model/cli.py
+# Point d'entrée en ligne de commande pour les lots (cron, tubes) : lit des
+# références ou des URL produit au fil de l'eau (fichier ou stdin) et écrit
+# une ligne NDJSON par référence dès qu'elle est terminée. Les messages des
+# moteurs partent sur stderr ; selenium n'est importé que si le moteur choisi
+# (ou un repli) en a besoin. Le moteur selenium passe par le démon
+# (Model.demon) s'il écoute.
+#
+#   cat refs.txt | python -m Model.cli > fiches.ndjson
+#   python -m Model.cli refs.txt --moteur selenium --workers 4 --sqlite resultats.sqlite
+
+from contextlib import redirect_stdout
+from urllib.parse import unquote, urlsplit
+import argparse
+import json
+import queue
+import re
+import sys
+import threading
+import time
+
+
+MOTEURS = ('http', 'selenium', 'sites')
+
+
+def lire_entrees(flux):
+    """Itère sur les lignes non vides et non commentées (#), sans tout lire d'avance."""
+    for ligne in flux:
+        ligne = ligne.strip()
+        if ligne and not ligne.startswith('#'):
+            yield ligne
+
+
+def est_url(texte):
+    return texte.startswith(("http://", "https://"))
+
+
+def reference_depuis_url(url):
+    """Nom de dossier pour une URL produit : son dernier segment de chemin, nettoyé."""
+    segments = [s for s in urlsplit(url).path.split('/') if s]
+    nom = unquote(segments[-1]) if segments else urlsplit(url).netloc
+    return re.sub(r'[^\w.-]+', '_', nom)
+
+
+class SansFichiers:
+    """Se passe à la place du gestionnaire de téléchargements : les fichiers sont ignorés, rien n'est gardé."""
+
+    def ajouter(self, url, folder_path, filename, headers=None):
+        return None
+
+
+# --- Moteurs : chaque fabrique renvoie (traiter(ref, url), fermer()) pour un worker ---
+
+def _traitement_http(ressources):
+    from Model.scrap_http import MoteurLeger
+
+    moteur = MoteurLeger(telechargements=ressources['telechargements'], cache=ressources['cache'])
+
+    def traiter(ref, url):
+        if url:
+            return url, moteur.traiter_url(url, ref)
+        return moteur.traiter_reference(ref)
+
+    return traiter, moteur.fermer
+
+
+def _traitement_selenium(ressources):
+    from Model.pilotes import FabriquePilotes
+    from Model.scrap import extract_main_product_details, traiter_reference
+    from Model.session_navigateur import EtatSession
+
+    with ressources['verrou']:
+        if 'fabrique' not in ressources:
+            ressources['fabrique'] = FabriquePilotes(reserve=False)
+    fabrique = ressources['fabrique']
+    driver = fabrique.obtenir()
+    session = EtatSession()
+
+    def traiter(ref, url):
+        if url:
+            return url, extract_main_product_details(driver, url, ref, ressources['telechargements'])
+        return traiter_reference(driver, ref, ressources['telechargements'], ressources['cache'], session)
+
+    return traiter, lambda: fabrique.rendre(driver)
+
+
+def _traitement_sites(ressources):
+    from Model.ordonnanceur import OrdonnanceurSites
+
+    with ressources['verrou']:
+        if 'ordonnanceur' not in ressources:
+            ressources['ordonnanceur'] = OrdonnanceurSites(ressources['sites'], ressources['telechargements'])
+    ordonnanceur = ressources['ordonnanceur']
+
+    def traiter(ref, url):
+        return ordonnanceur.traiter_reference(ref, url)[1:]
+
+    return traiter, lambda: None
+
+
+def _traitement_demon(ressources):
+    from Model.demon import ClientDemon
+
+    client = ClientDemon()
+
+    def traiter(ref, url):
+        if url:
+            return url, client.traiter_url(ref, url)
+        return client.traiter([ref])[0]
+
+    return traiter, client.fermer
+
+
+FABRIQUES = {'http': _traitement_http, 'selenium': _traitement_selenium, 'sites': _traitement_sites,
+             'demon': _traitement_demon}
+
+
+def executer(entrees, creer_traitement, nb_workers, ecrire):
+    """
+    Traite les entrées avec nb_workers threads ; la lecture de l'entrée ne
+    prend que quelques lignes d'avance (file bornée).
+    Args:
+        ecrire (callable): reçoit un dict par entrée, dans l'ordre d'achèvement
+    """
+    file = queue.Queue(maxsize=2 * nb_workers)
+
+    def travailler():
+        try:
+            traiter, fermer = creer_traitement()
+        except Exception as e:
+            print(f"Démarrage du worker impossible : {str(e)}", file=sys.stderr)
+            # On continue à vider la file pour ne pas bloquer la lecture
+            traiter, fermer = None, lambda: None
+        try:
+            while True:
+                entree = file.get()
+                if entree is None:
+                    return
+                url = entree if est_url(entree) else None
+                ref = reference_depuis_url(entree) if url else entree
+                enregistrement = {'entree': entree, 'ref': ref, 'product_url': None, 'details': None, 'erreur': None}
+                debut = time.perf_counter()
+                try:
+                    if traiter is None:
+                        raise RuntimeError("worker indisponible")
+                    enregistrement['product_url'], enregistrement['details'] = traiter(ref, url)
+                except Exception as e:
+                    enregistrement['erreur'] = str(e)
+                enregistrement['duree'] = round(time.perf_counter() - debut, 3)
+                ecrire(enregistrement)
+        finally:
+            fermer()
+
+    workers = [threading.Thread(target=travailler, daemon=True) for _ in range(nb_workers)]
+    for w in workers:
+        w.start()
+    for entree in entrees:
+        file.put(entree)
+    for _ in workers:
+        file.put(None)
+    for w in workers:
+        w.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m Model.cli",
+        description="Scrape des références ou URL produit lues au fil de l'eau ; une ligne NDJSON par résultat.",
+    )
+    parser.add_argument('entree', nargs='?', default='-', help="fichier de références/URL, - pour stdin (défaut)")
+    parser.add_argument('--moteur', choices=MOTEURS, default='http',
+                        help="http : lxml avec repli Selenium (défaut) ; selenium : Chrome ; sites : multi-sites")
+    parser.add_argument('--workers', type=int, default=1, help="traitements en parallèle")
+    parser.add_argument('--sites', default='deejay', help="moteur sites : adaptateurs, séparés par des virgules")
+    parser.add_argument('--sortie', default='-', help="fichier NDJSON, - pour stdout (défaut)")
+    parser.add_argument('--sqlite', help="enregistre aussi les fiches dans cette base (Model.resultats)")
+    parser.add_argument('--sans-fichiers', action='store_true', help="ne télécharge ni images ni MP3")
+    parser.add_argument('--sans-demon', action='store_true',
+                        help="moteur selenium : Chrome locaux même si le démon écoute")
+    args = parser.parse_args(argv)
+
+    moteur = args.moteur
+    if moteur == 'selenium' and not (args.sans_demon or args.sans_fichiers):
+        # Le démon télécharge lui-même les fichiers : pas de --sans-fichiers possible
+        from Model.demon import demon_disponible
+        if demon_disponible():
+            moteur = 'demon'
+            print("Démon de scraping détecté : lot traité par ses Chrome", file=sys.stderr)
+
+    from Model.cache_recherche import CacheRecherche
+    from Model.telechargement import GestionnaireTelechargements, resumer
+
+    stdout = sys.stdout
+    sortie = stdout if args.sortie == '-' else open(args.sortie, 'a', encoding='utf-8')
+    flux = sys.stdin if args.entree == '-' else open(args.entree, encoding='utf-8')
+    resultats = None
+    if args.sqlite:
+        from Model.resultats import ResultatsSQLite
+        resultats = ResultatsSQLite(args.sqlite)
+
+    ressources = {
+        'verrou': threading.Lock(),
+        'cache': CacheRecherche(),
+        # Sans fichiers : la fiche liste toujours ses assets, mais rien n'est téléchargé ni retenu
+        'telechargements': SansFichiers() if args.sans_fichiers else GestionnaireTelechargements(),
+        'sites': args.sites.split(','),
+    }
+    verrou_sortie = threading.Lock()
+    compteurs = {'total': 0, 'trouves': 0, 'erreurs': 0}
+
+    def ecrire(enregistrement):
+        ligne = json.dumps(enregistrement, ensure_ascii=False)
+        with verrou_sortie:
+            sortie.write(ligne + "\n")
+            sortie.flush()
+            compteurs['total'] += 1
+            compteurs['trouves'] += enregistrement['details'] is not None
+            compteurs['erreurs'] += enregistrement['erreur'] is not None
+        if resultats is not None:
+            resultats.ajouter(enregistrement['ref'], enregistrement['details'])
+
+    start_time = time.time()
+    # stdout est réservé au NDJSON : les print des moteurs vont sur stderr
+    with redirect_stdout(sys.stderr):
+        try:
+            executer(lire_entrees(flux), lambda: FABRIQUES[moteur](ressources),
+                     max(1, args.workers), ecrire)
+        finally:
+            if isinstance(ressources['telechargements'], GestionnaireTelechargements):
+                print(resumer(ressources['telechargements'].fermer()))
+            if 'fabrique' in ressources:
+                ressources['fabrique'].fermer()
+            if 'ordonnanceur' in ressources:
+                ressources['ordonnanceur'].fermer()
+            ressources['cache'].sauvegarder()
+            if resultats is not None:
+                resultats.fermer()
+            if flux is not sys.stdin:
+                flux.close()
+            if sortie is not stdout:
+                sortie.close()
+
+    print(f"{compteurs['total']} entrée(s), {compteurs['trouves']} fiche(s), {compteurs['erreurs']} erreur(s) "
+          f"en {time.time() - start_time:.1f} s", file=sys.stderr)
+    return 1 if compteurs['erreurs'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
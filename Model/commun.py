@@ -0,0 +1,85 @@
+# Model/commun.py
+# Éléments partagés par les moteurs de scraping, sans dépendance à Selenium.
+
+import os
+
+from Model.telechargement import telecharger
+
+
+# DEEJAY_URL permet de viser un autre site, ex. le faux deejay.de du banc d'essai (bench/)
+URL_ACCUEIL = os.environ.get("DEEJAY_URL", "https://www.deejay.de").rstrip("/")
+
+# Marqueur de la page « aucun résultat » de deejay.de (sélecteur CSS et/ou texte).
+# Avec lui, une référence introuvable est reconnue tout de suite et un délai
+# dépassé reste une erreur ; sans lui, une recherche sans produit attend le délai
+# puis vaut introuvable (les résultats peuvent arriver par JS après le chargement).
+INTROUVABLE_SELECTEUR = os.environ.get("DEEJAY_INTROUVABLE") or None
+INTROUVABLE_TEXTE = os.environ.get("DEEJAY_INTROUVABLE_TEXTE") or None
+
+REFERENCES = [ "OTP02","OTP03","OYTVIN04","PI06","POSS-009","POSS-011","PRRUKBLK044","PRRUKBLK053","PRRUKBLK127","PRRUKWHT008","REVENGE4","SOMALP128","SUPERSTYLE001","T3R016","TPTX006","TRI003","VAULTREC006"]
+
+
+def download_file(url, folder_path, filename, headers=None, session=None):
+    """Télécharge un fichier et le sauvegarde dans le dossier spécifié"""
+    return telecharger(url, folder_path, filename, headers, session)['ok']
+
+
+def enregistrer_fichier(telechargements, url, folder_path, filename, session=None):
+    """
+    Met le fichier dans la file du gestionnaire s'il y en a un (non bloquant),
+    sinon le télécharge tout de suite.
+    Returns:
+        bool: False si le téléchargement immédiat a échoué
+    """
+    if telechargements is not None:
+        telechargements.ajouter(url, folder_path, filename)
+        return True
+    return download_file(url, folder_path, filename, session=session)
+
+
+class CollecteurAssets:
+    """
+    Se passe à la place du gestionnaire de téléchargements lors de l'extraction :
+    note chaque fichier et, si un gestionnaire est fourni, le lui transmet en
+    gardant son Future (pour savoir quand tous les fichiers d'une fiche sont là).
+    """
+
+    def __init__(self, telechargements=None):
+        self.telechargements = telechargements
+        self.fichiers = []
+        self.futures = []
+
+    def ajouter(self, url, folder_path, filename, headers=None):
+        self.fichiers.append((url, folder_path, filename, headers))
+        if self.telechargements is not None:
+            self.futures.append(self.telechargements.ajouter(url, folder_path, filename, headers))
+
+
+def create_reference_folder(reference):
+    """Crée un dossier pour la référence si inexistant"""
+    folder_path = os.path.join(os.getcwd(), reference)
+    if not os.path.exists(folder_path):
+        os.makedirs(folder_path)
+    return folder_path
+
+
+def afficher_entete(ref):
+    print(f"\n=== TRAITEMENT DE {ref} ===")
+
+
+def afficher_resultat(ref, product_url, product_data):
+    """Affiche le résultat d'une référence (même format que la boucle séquentielle)."""
+    if not product_url:
+        print(f"Aucun produit trouvé pour {ref}")
+        return
+
+    if product_data:
+        print(f"Artiste***Titre: {product_data['artist']}***{product_data['title']}")
+        print(f"Description: {product_data['description']}")
+        print("")
+        for i, track in enumerate(product_data['tracks'], 1):
+            print(f"{i}. {track}")
+    else:
+        print("Échec extraction article principal")
+
+    print("=" * 60)
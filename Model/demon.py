@@ -0,0 +1,191 @@
+# Model/demon.py
+# Démon de scraping longue durée : garde des Chrome démarrés entre deux lots
+# pour que la GUI et la ligne de commande n'aient plus à payer le démarrage.
+# Les clients (controleur.taches, Model.cli) passent par lui s'il écoute.
+#
+#   python -m Model.demon [nb_pilotes]        # lance le démon
+#   traiter_via_demon(["OTP02", "PI06"])      # côté client
+#
+# multiprocessing.connection dépicke les messages : seul un client qui connaît
+# la clé du démon (fichier lisible par son seul propriétaire) est accepté.
+
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+import os
+import secrets
+import sys
+import threading
+
+
+ADRESSE_DEMON = ('127.0.0.1', 6061)
+CHEMIN_CLE = os.path.join(os.path.expanduser("~"), ".demon_deejay.cle")
+
+
+def cle_demon(chemin=CHEMIN_CLE, creer=False):
+    """
+    Clé d'authentification du démon, tirée au hasard une fois par installation
+    et rangée dans un fichier en mode 0600.
+    Args:
+        creer (bool): crée le fichier s'il n'existe pas (côté démon)
+    Returns:
+        bytes: la clé, ou None si elle n'existe pas encore (aucun démon lancé)
+    """
+    try:
+        with open(chemin, 'rb') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        if not creer:
+            return None
+    cle = secrets.token_hex(32).encode('ascii')
+    try:
+        descripteur = os.open(chemin, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return cle_demon(chemin)  # Créée entre-temps par un autre démon
+    with os.fdopen(descripteur, 'wb') as f:
+        f.write(cle)
+    return cle
+
+
+def _servir(connexion, fabrique, cache, telechargements, nb_pilotes):
+    """Traite les lots d'un client : chaque résultat lui est renvoyé dès qu'il est prêt."""
+    from Model.scrap import extract_main_product_details, traiter_references_pool
+
+    with connexion:
+        try:
+            while True:
+                message = connexion.recv()
+                if message[0] == 'stats':
+                    connexion.send(('stats', fabrique.statistiques(), cache.statistiques()))
+                    continue
+                if message[0] == 'traiter_url':
+                    # URL produit déjà connue : extraction seule, sur un pilote de la fabrique
+                    _, ref, product_url = message
+                    driver = fabrique.obtenir()
+                    try:
+                        product_data = extract_main_product_details(driver, product_url, ref, telechargements)
+                    finally:
+                        fabrique.rendre(driver)
+                    connexion.send(('resultat', ref, product_url, product_data))
+                    connexion.send(('fin',))
+                    continue
+                if message[0] != 'traiter':
+                    connexion.send(('erreur', f"Commande inconnue : {message[0]}"))
+                    continue
+
+                references = message[1]
+
+                def envoyer(ref, product_url, product_data):
+                    connexion.send(('resultat', ref, product_url, product_data))
+
+                traiter_references_pool(references, nb_pilotes, callback=envoyer,
+                                        telechargements=telechargements, cache=cache,
+                                        fabrique=fabrique)
+                telechargements.attendre()
+                cache.sauvegarder()
+                connexion.send(('fin',))
+        except (EOFError, OSError):
+            pass  # Client déconnecté
+
+
+def lancer_demon(nb_pilotes=2, adresse=ADRESSE_DEMON):
+    from Model.cache_recherche import CacheRecherche
+    from Model.pilotes import FabriquePilotes
+    from Model.telechargement import GestionnaireTelechargements
+
+    cle = cle_demon(creer=True)
+    fabrique = FabriquePilotes(reserve=True)
+    cache = CacheRecherche()
+    telechargements = GestionnaireTelechargements()
+    print(f"Démon de scraping à l'écoute sur {adresse[0]}:{adresse[1]} ({nb_pilotes} pilotes, clé {CHEMIN_CLE})")
+    try:
+        with Listener(adresse, authkey=cle) as ecoute:
+            while True:
+                try:
+                    connexion = ecoute.accept()
+                except (AuthenticationError, EOFError, OSError) as e:
+                    print(f"Connexion refusée : {str(e)}")
+                    continue
+                threading.Thread(
+                    target=_servir,
+                    args=(connexion, fabrique, cache, telechargements, nb_pilotes),
+                    daemon=True,
+                ).start()
+    finally:
+        telechargements.fermer()
+        cache.sauvegarder()
+        fabrique.fermer()
+
+
+class ClientDemon:
+    """
+    Connexion à un démon, réutilisable pour plusieurs lots (un worker de la
+    GUI ou de la ligne de commande en garde une).
+    Raises:
+        ConnectionRefusedError: si aucun démon n'écoute (ou pas de clé)
+    """
+
+    def __init__(self, adresse=ADRESSE_DEMON):
+        cle = cle_demon()
+        if cle is None:
+            raise ConnectionRefusedError(f"pas de clé de démon ({CHEMIN_CLE})")
+        self._connexion = Client(adresse, authkey=cle)
+
+    def _recevoir(self, callback=None):
+        resultats = []
+        while True:
+            message = self._connexion.recv()
+            if message[0] == 'fin':
+                return resultats
+            if message[0] == 'erreur':
+                raise RuntimeError(message[1])
+            _, ref, product_url, product_data = message
+            resultats.append((product_url, product_data))
+            if callback:
+                callback(ref, product_url, product_data)
+
+    def traiter(self, references, callback=None):
+        """
+        Args:
+            callback (callable): appelé avec (ref, product_url, product_data) dans l'ordre
+        Returns:
+            list of tuple: (product_url, product_data) dans l'ordre des références
+        """
+        self._connexion.send(('traiter', list(references)))
+        return self._recevoir(callback)
+
+    def traiter_url(self, ref, product_url):
+        """Extrait une page produit déjà connue. Returns: product_data ou None"""
+        self._connexion.send(('traiter_url', ref, product_url))
+        return self._recevoir()[0][1]
+
+    def fermer(self):
+        self._connexion.close()
+
+
+def demon_disponible(adresse=ADRESSE_DEMON):
+    try:
+        ClientDemon(adresse).fermer()
+        return True
+    except (OSError, EOFError, AuthenticationError):
+        return False
+
+
+def traiter_via_demon(references, callback=None, adresse=ADRESSE_DEMON):
+    """
+    Envoie un lot au démon.
+    Args:
+        callback (callable): appelé avec (ref, product_url, product_data) dans l'ordre
+    Returns:
+        list of tuple: (product_url, product_data) dans l'ordre des références
+    Raises:
+        ConnectionRefusedError: si aucun démon n'écoute
+    """
+    client = ClientDemon(adresse)
+    try:
+        return client.traiter(references, callback)
+    finally:
+        client.fermer()
+
+
+if __name__ == "__main__":
+    lancer_demon(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
@@ -0,0 +1,113 @@
+# Model/depot.py
+# Dépôt de fichiers adressé par contenu : chaque image ou MP3 n'est stocké
+# qu'une fois sous son SHA-256 (.depot/objets/ab/abcdef...) et les dossiers
+# de référence n'en contiennent que des liens physiques. Un index URL ->
+# SHA-256 évite de retélécharger un fichier déjà connu sous la même URL
+# (rééditions, variantes de couleur, compilations).
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+
+
+RACINE_DEPOT = os.path.join(os.getcwd(), ".depot")
+
+
+class DepotContenu:
+    """Partagé par tous les threads de téléchargement."""
+
+    def __init__(self, racine=RACINE_DEPOT):
+        self.racine = racine
+        self.dossier_objets = os.path.join(racine, "objets")
+        os.makedirs(self.dossier_objets, exist_ok=True)
+        self._verrou = threading.Lock()
+        self._connexion = sqlite3.connect(os.path.join(racine, "index.sqlite"), check_same_thread=False)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute(
+            """CREATE TABLE IF NOT EXISTS urls (
+                   url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, taille INTEGER,
+                   etag TEXT, last_modified TEXT, maj REAL
+               )"""
+        )
+        self.liens = 0
+        self.copies = 0  # Lien physique impossible (autre système de fichiers...)
+
+    def chemin_objet(self, sha256):
+        return os.path.join(self.dossier_objets, sha256[:2], sha256)
+
+    def chercher(self, url):
+        """
+        Returns:
+            dict: entrée de l'index (sha256, taille, etag, last_modified) si
+            l'URL est connue et son objet présent dans le dépôt, sinon None
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT sha256, taille, etag, last_modified FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if ligne is None or not os.path.isfile(self.chemin_objet(ligne[0])):
+            return None
+        return dict(zip(('sha256', 'taille', 'etag', 'last_modified'), ligne))
+
+    def enregistrer_url(self, url, sha256, taille=None, etag=None, last_modified=None):
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO urls (url, sha256, taille, etag, last_modified, maj) VALUES (?, ?, ?, ?, ?, ?)",
+                (url, sha256, taille, etag, last_modified, time.time()),
+            )
+
+    def lier(self, sha256, destination):
+        """Fait pointer destination sur l'objet (lien physique, copie à défaut)."""
+        objet = self.chemin_objet(sha256)
+        temporaire = destination + ".lien"
+        if os.path.lexists(temporaire):
+            os.remove(temporaire)
+        try:
+            os.link(objet, temporaire)
+            self.liens += 1
+        except OSError:
+            shutil.copyfile(objet, temporaire)
+            self.copies += 1
+        # Remplacement atomique : les autres liens vers l'ancien contenu ne sont pas touchés
+        os.replace(temporaire, destination)
+
+    def importer(self, source, sha256, destination):
+        """
+        Range le fichier téléchargé source (hash déjà calculé) dans le dépôt
+        puis le lie à destination. Si le contenu y est déjà, source est jeté.
+        """
+        objet = self.chemin_objet(sha256)
+        os.makedirs(os.path.dirname(objet), exist_ok=True)
+        if os.path.isfile(objet):
+            os.remove(source)
+        else:
+            os.replace(source, objet)
+        self.lier(sha256, destination)
+
+    def statistiques(self):
+        """Returns: (nombre d'objets, octets stockés)"""
+        nombre = octets = 0
+        for dossier, _, fichiers in os.walk(self.dossier_objets):
+            for nom in fichiers:
+                nombre += 1
+                octets += os.path.getsize(os.path.join(dossier, nom))
+        return nombre, octets
+
+    def fermer(self):
+        with self._verrou:
+            self._connexion.close()
+
+
+_depot = None
+_verrou_depot = threading.Lock()
+
+
+def depot():
+    """Dépôt par défaut (RACINE_DEPOT), créé au premier téléchargement."""
+    global _depot
+    with _verrou_depot:
+        if _depot is None:
+            _depot = DepotContenu()
+        return _depot
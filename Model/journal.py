@@ -0,0 +1,217 @@
+# Model/journal.py
+# Journal durable d'un lot de scraping (SQLite) : l'état de chaque référence
+# est écrit à chaque étape, un lot relancé après un crash reprend là où il
+# s'était arrêté, et les échecs sont relancés plus tard avec un délai croissant.
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+CHEMIN_JOURNAL = os.path.join(os.getcwd(), ".journal_scraping.sqlite")
+MAX_ESSAIS = 4  # Au-delà, l'échec de la référence est définitif
+DELAI_BASE = 30  # Secondes avant la première relance, doublé à chaque échec
+DELAI_MAX = 15 * 60
+
+# États d'une référence, dans l'ordre du traitement
+EN_ATTENTE = 'en_attente'
+RESOLUE = 'resolue'        # URL produit connue (ou référence introuvable)
+EXTRAITE = 'extraite'      # Fiche extraite, fichiers pas encore tous téléchargés
+TERMINEE = 'terminee'      # Fiche et fichiers faits
+ECHEC = 'echec'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS taches (
+    lot            TEXT NOT NULL,
+    reference      TEXT NOT NULL,
+    position       INTEGER NOT NULL,
+    etat           TEXT NOT NULL,
+    product_url    TEXT,
+    details        TEXT,
+    essais         INTEGER NOT NULL DEFAULT 0,
+    erreur         TEXT,
+    prochain_essai REAL,
+    maj            REAL,
+    PRIMARY KEY (lot, reference)
+);
+CREATE INDEX IF NOT EXISTS idx_taches_etat ON taches(lot, etat);
+"""
+
+
+def identifiant_lot(references):
+    """Un même lot (mêmes références, même ordre) garde le même journal d'un lancement à l'autre."""
+    return hashlib.sha1("\n".join(references).encode('utf-8')).hexdigest()[:12]
+
+
+def delai_relance(essais):
+    """Backoff exponentiel : DELAI_BASE, 2x, 4x... plafonné à DELAI_MAX."""
+    return min(DELAI_MAX, DELAI_BASE * 2 ** max(0, essais - 1))
+
+
+class JournalTaches:
+    """
+    Journal d'un lot. Chaque marquage est validé aussitôt (mode WAL), un
+    kill du processus ne perd donc que l'étape en cours.
+    Seul un lot interrompu est repris : un lot allé au bout (tout terminé ou
+    essais épuisés) repart de zéro au lancement suivant.
+    Utilisable depuis plusieurs threads (workers, fin des téléchargements).
+    """
+
+    def __init__(self, references, chemin=CHEMIN_JOURNAL, lot=None, max_essais=MAX_ESSAIS):
+        self.references = list(references)
+        self.lot = lot or identifiant_lot(self.references)
+        self.max_essais = max_essais
+        self._verrou = threading.Lock()
+        self._suivis = 0  # Références dont les fichiers sont encore suivis
+        self._fin_suivis = threading.Condition()
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.executescript(SCHEMA)
+        with self._connexion:
+            if self._lot_fini():
+                self._connexion.execute("DELETE FROM taches WHERE lot = ?", (self.lot,))
+            self._connexion.executemany(
+                "INSERT OR IGNORE INTO taches (lot, reference, position, etat, maj) VALUES (?, ?, ?, ?, ?)",
+                [(self.lot, ref, i, EN_ATTENTE, time.time()) for i, ref in enumerate(self.references)],
+            )
+
+    def _lot_fini(self):
+        """Vrai si le lot a déjà été mené au bout : plus rien à traiter ni à relancer."""
+        restantes = self._connexion.execute(
+            "SELECT COUNT(*) FROM taches WHERE lot = ? AND (etat NOT IN (?, ?) OR (etat = ? AND essais < ?))",
+            (self.lot, TERMINEE, ECHEC, ECHEC, self.max_essais),
+        ).fetchone()[0]
+        existantes = self._connexion.execute("SELECT COUNT(*) FROM taches WHERE lot = ?", (self.lot,)).fetchone()[0]
+        return existantes > 0 and restantes == 0
+
+    def _maj(self, ref, **champs):
+        champs['maj'] = time.time()
+        colonnes = ", ".join(f"{nom} = ?" for nom in champs)
+        with self._verrou, self._connexion:
+            self._connexion.execute(
+                f"UPDATE taches SET {colonnes} WHERE lot = ? AND reference = ?",
+                (*champs.values(), self.lot, ref),
+            )
+
+    def _selection(self, condition, parametres=()):
+        with self._verrou:
+            return [ligne[0] for ligne in self._connexion.execute(
+                f"SELECT reference FROM taches WHERE lot = ? AND {condition} ORDER BY position",
+                (self.lot, *parametres),
+            )]
+
+    # --- Lecture ---
+
+    def etat(self, ref):
+        """
+        Returns:
+            tuple: (etat, product_url, details) ; details est le dict de la fiche ou None
+        """
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT etat, product_url, details FROM taches WHERE lot = ? AND reference = ?",
+                (self.lot, ref),
+            ).fetchone()
+        if ligne is None:
+            return EN_ATTENTE, None, None
+        etat, product_url, details = ligne
+        return etat, product_url, json.loads(details) if details else None
+
+    def a_traiter(self):
+        """Références jamais terminées ni en échec, dans l'ordre du lot."""
+        return self._selection("etat NOT IN (?, ?)", (TERMINEE, ECHEC))
+
+    def a_relancer(self):
+        """Références en échec ayant encore des essais, triées par position."""
+        return self._selection("etat = ? AND essais < ?", (ECHEC, self.max_essais))
+
+    def attente_relance(self, ref):
+        """Secondes restant avant de pouvoir relancer ref (0 si c'est déjà l'heure)."""
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT prochain_essai FROM taches WHERE lot = ? AND reference = ?", (self.lot, ref)
+            ).fetchone()
+        return max(0.0, (ligne[0] or 0) - time.time()) if ligne else 0.0
+
+    def compter(self):
+        with self._verrou:
+            return dict(self._connexion.execute(
+                "SELECT etat, COUNT(*) FROM taches WHERE lot = ? GROUP BY etat", (self.lot,)
+            ).fetchall())
+
+    def resume(self):
+        comptes = self.compter()
+        return (f"Journal {self.lot} : {comptes.get(TERMINEE, 0)}/{len(self.references)} terminées, "
+                f"{comptes.get(ECHEC, 0)} en échec, "
+                f"{sum(n for e, n in comptes.items() if e not in (TERMINEE, ECHEC))} en cours")
+
+    # --- Marquage ---
+
+    def resolue(self, ref, product_url):
+        self._maj(ref, etat=RESOLUE, product_url=product_url, erreur=None)
+
+    def extraite(self, ref, details):
+        self._maj(ref, etat=EXTRAITE, details=json.dumps(details, ensure_ascii=False), erreur=None)
+
+    def terminee(self, ref):
+        self._maj(ref, etat=TERMINEE, erreur=None)
+
+    def echec(self, ref, erreur):
+        """Compte l'essai et programme la prochaine relance (backoff exponentiel)."""
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT essais FROM taches WHERE lot = ? AND reference = ?", (self.lot, ref)
+            ).fetchone()
+        essais = (ligne[0] if ligne else 0) + 1
+        self._maj(ref, etat=ECHEC, essais=essais, erreur=str(erreur),
+                  prochain_essai=time.time() + delai_relance(essais))
+
+    def suivre_fichiers(self, ref, futures):
+        """
+        Passe ref à TERMINEE quand tous les téléchargements mis en file sont
+        finis, ou en échec si l'un d'eux a échoué (sans bloquer l'appelant).
+        Le marquage se fait dans un rappel de fin : attendre_suivis() garantit
+        qu'il est écrit avant de relire le journal ou de le fermer.
+        """
+        futures = list(futures)
+        if not futures:
+            self.terminee(ref)
+            return
+        restants = [len(futures)]
+        verrou = threading.Lock()
+        with self._fin_suivis:
+            self._suivis += 1
+
+        def fin(_):
+            with verrou:
+                restants[0] -= 1
+                if restants[0]:
+                    return
+            try:
+                rates = [f for f in futures if f.exception() is not None or not f.result()['ok']]
+                if rates:
+                    erreur = rates[0].exception() or rates[0].result()['erreur']
+                    self.echec(ref, f"{len(rates)} fichier(s) non téléchargé(s) : {erreur}")
+                else:
+                    self.terminee(ref)
+            finally:
+                with self._fin_suivis:
+                    self._suivis -= 1
+                    self._fin_suivis.notify_all()
+
+        for f in futures:
+            f.add_done_callback(fin)
+
+    def attendre_suivis(self):
+        """Bloque jusqu'à ce que toutes les références suivies aient été marquées."""
+        with self._fin_suivis:
+            self._fin_suivis.wait_for(lambda: self._suivis == 0)
+
+    def fermer(self):
+        """Attend les marquages des téléchargements en cours, puis ferme la base."""
+        self.attendre_suivis()
+        with self._verrou:
+            self._connexion.close()
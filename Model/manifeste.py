@@ -0,0 +1,57 @@
+# Model/manifeste.py
+# Index des fichiers téléchargés, un manifeste JSON par dossier de référence :
+# URL, taille, ETag/Last-Modified et SHA-256 de chaque fichier.
+
+import json
+import os
+import threading
+
+
+NOM_MANIFESTE = ".manifeste.json"
+
+_manifestes = {}
+_verrou_global = threading.Lock()
+
+
+class Manifeste:
+    """Manifeste d'un dossier, partagé par tous les threads qui y écrivent."""
+
+    def __init__(self, folder_path):
+        self.chemin = os.path.join(folder_path, NOM_MANIFESTE)
+        self._verrou = threading.Lock()
+        try:
+            with open(self.chemin, encoding='utf-8') as f:
+                self._entrees = json.load(f)
+        except (OSError, ValueError):
+            self._entrees = {}
+
+    def lire(self, filename):
+        with self._verrou:
+            entree = self._entrees.get(filename)
+            return dict(entree) if entree else None
+
+    def ecrire(self, filename, **champs):
+        """Met à jour l'entrée du fichier et réécrit le manifeste de façon atomique."""
+        with self._verrou:
+            self._entrees.setdefault(filename, {}).update(champs)
+            temporaire = self.chemin + ".tmp"
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump(self._entrees, f, indent=2, ensure_ascii=False)
+            os.replace(temporaire, self.chemin)
+
+    def est_complet(self, filename, url):
+        """Vrai si le fichier a déjà été téléchargé en entier depuis cette URL."""
+        entree = self.lire(filename)
+        if not entree or entree.get('url') != url or not entree.get('sha256'):
+            return False
+        file_path = os.path.join(os.path.dirname(self.chemin), filename)
+        return os.path.isfile(file_path) and os.path.getsize(file_path) == entree.get('taille')
+
+
+def manifeste(folder_path):
+    """Renvoie l'unique instance de Manifeste associée au dossier."""
+    folder_path = os.path.abspath(folder_path)
+    with _verrou_global:
+        if folder_path not in _manifestes:
+            _manifestes[folder_path] = Manifeste(folder_path)
+        return _manifestes[folder_path]
@@ -0,0 +1,205 @@
+# Model/mesures.py
+# Instrumentation légère du scraping : durée de chaque phase (histogrammes à
+# seaux fixes), octets téléchargés, totaux par référence, export JSON et
+# texte Prometheus, profilage optionnel. Assez peu coûteux pour rester actif.
+
+from contextlib import contextmanager
+from functools import wraps
+import json
+import os
+import threading
+import time
+
+
+# Bornes supérieures des seaux (secondes), comme un histogramme Prometheus
+SEAUX = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class _Histogramme:
+    __slots__ = ('seaux', 'nombre', 'somme', 'maximum', 'erreurs')
+
+    def __init__(self):
+        self.seaux = [0] * (len(SEAUX) + 1)  # Dernier seau : au-delà de SEAUX[-1]
+        self.nombre = 0
+        self.somme = 0.0
+        self.maximum = 0.0
+        self.erreurs = 0
+
+    def observer(self, duree, erreur=False):
+        i = 0
+        while i < len(SEAUX) and duree > SEAUX[i]:
+            i += 1
+        self.seaux[i] += 1
+        self.nombre += 1
+        self.somme += duree
+        self.maximum = max(self.maximum, duree)
+        self.erreurs += erreur
+
+    def quantile(self, q):
+        """Estimation par interpolation linéaire dans le seau (comme histogram_quantile)."""
+        if not self.nombre:
+            return 0.0
+        rang = q * self.nombre
+        cumul = 0
+        for i, n in enumerate(self.seaux):
+            if cumul + n >= rang and n:
+                bas = SEAUX[i - 1] if i else 0.0
+                haut = SEAUX[i] if i < len(SEAUX) else self.maximum
+                return min(self.maximum, bas + (haut - bas) * (rang - cumul) / n)
+            cumul += n
+        return self.maximum
+
+    def en_dict(self):
+        return {
+            'nombre': self.nombre, 'somme': round(self.somme, 6), 'max': round(self.maximum, 6),
+            'erreurs': self.erreurs, 'p50': round(self.quantile(0.5), 6), 'p95': round(self.quantile(0.95), 6),
+            'seaux': dict(zip([str(b) for b in SEAUX] + ['+Inf'], self.seaux)),
+        }
+
+
+class Mesures:
+    """
+    Collecteur de mesures partagé par les threads.
+    Chaque observation ne coûte qu'un verrou et quelques additions.
+    """
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.phases = {}
+        self.octets = 0
+        self.par_reference = {}  # ref -> {phase: secondes, 'octets': n}
+        self.debut = time.time()
+
+    def observer(self, phase, duree, ref=None, octets=0, erreur=False):
+        with self._verrou:
+            histo = self.phases.get(phase)
+            if histo is None:
+                histo = self.phases[phase] = _Histogramme()
+            histo.observer(duree, erreur)
+            self.octets += octets
+            if ref is not None:
+                totaux = self.par_reference.setdefault(ref, {})
+                totaux[phase] = totaux.get(phase, 0.0) + duree
+                if octets:
+                    totaux['octets'] = totaux.get('octets', 0) + octets
+
+    @contextmanager
+    def phase(self, nom, ref=None):
+        """with MESURES.phase('attente_iframe', ref): ... ; une exception est comptée comme erreur."""
+        debut = time.perf_counter()
+        erreur = False
+        try:
+            yield
+        except BaseException:
+            erreur = True
+            raise
+        finally:
+            self.observer(nom, time.perf_counter() - debut, ref, erreur=erreur)
+
+    def chronometre(self, nom):
+        """Décorateur : mesure chaque appel de la fonction sous la phase nom."""
+        def decorateur(fonction):
+            @wraps(fonction)
+            def enveloppe(*args, **kwargs):
+                with self.phase(nom):
+                    return fonction(*args, **kwargs)
+            return enveloppe
+        return decorateur
+
+    def reinitialiser(self):
+        with self._verrou:
+            self.phases.clear()
+            self.par_reference.clear()
+            self.octets = 0
+            self.debut = time.time()
+
+    # --- Exports ---
+
+    def en_dict(self):
+        with self._verrou:
+            return {
+                'debut': self.debut,
+                'duree': time.time() - self.debut,
+                'octets': self.octets,
+                'phases': {nom: h.en_dict() for nom, h in sorted(self.phases.items())},
+                'references': {ref: dict(t) for ref, t in self.par_reference.items()},
+            }
+
+    def exporter_json(self, chemin):
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump(self.en_dict(), f, ensure_ascii=False, indent=2)
+
+    def exporter_prometheus(self, chemin):
+        """Format texte d'exposition Prometheus (pour le textfile collector de node_exporter)."""
+        lignes = [
+            "# HELP scrap_phase_secondes Durée des phases du scraping",
+            "# TYPE scrap_phase_secondes histogram",
+        ]
+        with self._verrou:
+            for nom, h in sorted(self.phases.items()):
+                cumul = 0
+                for borne, n in zip([str(b) for b in SEAUX] + ['+Inf'], h.seaux):
+                    cumul += n
+                    lignes.append(f'scrap_phase_secondes_bucket{{phase="{nom}",le="{borne}"}} {cumul}')
+                lignes.append(f'scrap_phase_secondes_sum{{phase="{nom}"}} {h.somme:.6f}')
+                lignes.append(f'scrap_phase_secondes_count{{phase="{nom}"}} {h.nombre}')
+            lignes.append("# HELP scrap_phase_erreurs_total Phases terminées par une exception")
+            lignes.append("# TYPE scrap_phase_erreurs_total counter")
+            for nom, h in sorted(self.phases.items()):
+                lignes.append(f'scrap_phase_erreurs_total{{phase="{nom}"}} {h.erreurs}')
+            lignes.append("# TYPE scrap_octets_telecharges_total counter")
+            lignes.append(f"scrap_octets_telecharges_total {self.octets}")
+        # Écriture atomique : le collecteur ne lit jamais un fichier à moitié écrit
+        with open(chemin + ".tmp", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lignes) + "\n")
+        os.replace(chemin + ".tmp", chemin)
+
+    def rapport(self):
+        """Tableau texte des phases, de la plus coûteuse à la moins coûteuse."""
+        lignes = [f"{'Phase':<24}{'n':>6}{'total (s)':>11}{'moy':>8}{'p50':>8}{'p95':>8}{'max':>8}{'err':>5}"]
+        with self._verrou:
+            for nom, h in sorted(self.phases.items(), key=lambda p: -p[1].somme):
+                lignes.append(
+                    f"{nom:<24}{h.nombre:>6}{h.somme:>11.2f}{h.somme / h.nombre:>8.2f}"
+                    f"{h.quantile(0.5):>8.2f}{h.quantile(0.95):>8.2f}{h.maximum:>8.2f}{h.erreurs:>5}"
+                )
+            lignes.append(f"Octets téléchargés : {self.octets / 1e6:.1f} Mo")
+        return "\n".join(lignes)
+
+
+MESURES = Mesures()
+
+
+@contextmanager
+def profil(moteur=None, sortie="profil_scraping"):
+    """
+    Profilage optionnel d'un bloc : moteur 'cprofile' (stats dans
+    <sortie>.prof, lisibles avec pstats/snakeviz) ou 'pyinstrument'
+    (<sortie>.html). Sans moteur, ne fait rien.
+    """
+    if not moteur:
+        yield
+        return
+    if moteur == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(sortie + ".html", 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+            print(f"Profil écrit dans {sortie}.html")
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(sortie + ".prof")
+            print(f"Profil écrit dans {sortie}.prof")
@@ -0,0 +1,221 @@
+# Model/ordonnanceur.py
+# Ordonnanceur multi-sites : chaque référence est cherchée en parallèle sur
+# tous les sites (adaptateurs de Model.adaptateurs), chacun avec son seau à
+# jetons et ses propres pilotes, et la première fiche valide l'emporte.
+# Le débit total monte sans qu'aucun site ne soit sollicité au-delà de sa limite.
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import sys
+import threading
+import time
+
+from Model.adaptateurs import creer_adaptateur
+from Model.commun import (
+    REFERENCES, CollecteurAssets, afficher_entete, afficher_resultat, create_reference_folder,
+)
+from Model.resultats import ResultatsSQLite
+from Model.telechargement import GestionnaireTelechargements, resumer
+
+
+class SeauJetons:
+    """Limiteur de débit : debit jetons/s, au plus capacite d'avance."""
+
+    def __init__(self, debit, capacite):
+        self.debit = debit
+        self.capacite = capacite
+        self._jetons = float(capacite)
+        self._dernier = time.monotonic()
+        self._verrou = threading.Lock()
+        self.attente_totale = 0.0
+
+    def prendre(self):
+        """Bloque jusqu'à obtenir un jeton."""
+        while True:
+            with self._verrou:
+                maintenant = time.monotonic()
+                self._jetons = min(self.capacite, self._jetons + (maintenant - self._dernier) * self.debit)
+                self._dernier = maintenant
+                if self._jetons >= 1:
+                    self._jetons -= 1
+                    return
+                attente = (1 - self._jetons) / self.debit
+                self.attente_totale += attente
+            time.sleep(attente)
+
+
+class _Site:
+    """Un adaptateur, son seau à jetons, ses workers et leurs pilotes."""
+
+    def __init__(self, adaptateur):
+        self.adaptateur = adaptateur
+        self.seau = SeauJetons(adaptateur.debit, adaptateur.rafale)
+        self.fabrique = None
+        if adaptateur.navigateur:
+            from Model.pilotes import DOSSIER_PILOTES, FabriquePilotes
+
+            self.fabrique = FabriquePilotes(os.path.join(DOSSIER_PILOTES, adaptateur.nom), reserve=False)
+        self._executor = ThreadPoolExecutor(max_workers=adaptateur.nb_pilotes,
+                                            thread_name_prefix=f"site_{adaptateur.nom}")
+        self._local = threading.local()
+        self._pilotes = []
+        self._verrou = threading.Lock()
+        self.victoires = 0
+
+    def _pilote(self):
+        """Pilote et session du worker courant, créés à sa première tâche."""
+        if not hasattr(self._local, 'driver'):
+            self._local.driver = self.fabrique.obtenir() if self.fabrique else None
+            self._local.session = self.adaptateur.nouvelle_session()
+            with self._verrou:
+                self._pilotes.append(self._local.driver)
+        return self._local.driver, self._local.session
+
+    def _recycler(self):
+        """Après une erreur : un Chrome planté est remplacé à la tâche suivante."""
+        from Model.pilotes import pilote_vivant
+
+        driver = getattr(self._local, 'driver', None)
+        if driver is not None and not pilote_vivant(driver):
+            with self._verrou:
+                self._pilotes.remove(driver)
+            self.fabrique.jeter(driver)
+            del self._local.driver
+
+    def _chercher(self, ref, trouve, requete):
+        if trouve.is_set():
+            return None, None  # Un autre site a déjà répondu
+        driver, session = self._pilote()
+        try:
+            self.seau.prendre()
+            product_url = self.adaptateur.resoudre(driver, requete, session)
+            if not product_url or trouve.is_set():
+                return product_url, None
+            self.seau.prendre()
+            # Fichiers seulement notés : seuls ceux du site gagnant seront téléchargés
+            details = self.adaptateur.extraire(driver, product_url, ref, CollecteurAssets(), session)
+            return product_url, details
+        except Exception:
+            if self.fabrique is not None:
+                self._recycler()
+            raise
+
+    def soumettre(self, ref, trouve, requete=None):
+        return self._executor.submit(self._chercher, ref, trouve, requete or ref)
+
+    def fermer(self):
+        self._executor.shutdown(wait=True)
+        if self.fabrique is not None:
+            for driver in self._pilotes:
+                self.fabrique.jeter(driver)
+            self.fabrique.fermer()
+
+
+class OrdonnanceurSites:
+    """
+    Args:
+        sites (iterable of str): noms d'adaptateurs inscrits, par ordre de préférence
+        telechargements (GestionnaireTelechargements): reçoit les fichiers des fiches retenues
+    """
+
+    def __init__(self, sites=('deejay',), telechargements=None):
+        self.sites = [_Site(creer_adaptateur(nom)) for nom in sites]
+        self.telechargements = telechargements
+
+    def traiter_reference(self, ref, requete=None):
+        """
+        Cherche ref sur tous les sites à la fois ; la première fiche extraite l'emporte
+        et les recherches pas encore commencées ailleurs sont annulées.
+        Args:
+            requete (str): ce que les adaptateurs résolvent (ex. une URL
+                produit), si ce n'est pas ref elle-même
+        Returns:
+            tuple: (site, product_url, product_data), chacun pouvant valoir None
+        """
+        trouve = threading.Event()
+        futures = {site.soumettre(ref, trouve, requete): site for site in self.sites}
+        meilleur = (None, None, None)
+        for future in as_completed(futures):
+            site = futures[future]
+            try:
+                product_url, details = future.result()
+            except Exception as e:
+                print(f"[{site.adaptateur.nom}] Erreur sur {ref}: {str(e)}")
+                continue
+            if details:
+                trouve.set()
+                for autre in futures:
+                    autre.cancel()
+                with site._verrou:
+                    site.victoires += 1
+                self._telecharger(site, ref, details)
+                return site.adaptateur.nom, product_url, details
+            if product_url and meilleur[1] is None:
+                meilleur = (site.adaptateur.nom, product_url, None)
+        return meilleur
+
+    def _telecharger(self, site, ref, details):
+        folder_path = create_reference_folder(ref)
+        for asset in site.adaptateur.lister_assets(details):
+            if self.telechargements is not None:
+                self.telechargements.ajouter(asset['url'], folder_path, asset['fichier'])
+
+    def traiter_references(self, references, callback=None):
+        """
+        Traite le lot avec autant de références en vol que de workers au total.
+        Args:
+            callback (callable): appelé avec (ref, site, product_url, product_data)
+                dans l'ordre d'achèvement
+        Returns:
+            list of tuple: (site, product_url, product_data) dans l'ordre des références
+        """
+        en_vol = max(1, sum(site.adaptateur.nb_pilotes for site in self.sites))
+        resultats = [None] * len(references)
+        with ThreadPoolExecutor(max_workers=en_vol, thread_name_prefix="ordonnanceur") as executor:
+            futures = {executor.submit(self.traiter_reference, ref): i for i, ref in enumerate(references)}
+            for future in as_completed(futures):
+                i = futures[future]
+                resultats[i] = future.result()
+                if callback:
+                    callback(references[i], *resultats[i])
+        return resultats
+
+    def fermer(self):
+        for site in self.sites:
+            site.fermer()
+
+    def resume(self):
+        return "Sites : " + ", ".join(
+            f"{site.adaptateur.nom} {site.victoires} fiche(s), {site.seau.attente_totale:.1f} s de limitation"
+            for site in self.sites
+        )
+
+
+def main(references=REFERENCES, sites=('deejay',)):
+    start_time = time.time()
+    telechargements = GestionnaireTelechargements()
+    resultats = ResultatsSQLite()
+    ordonnanceur = OrdonnanceurSites(sites, telechargements)
+
+    def afficher(ref, site, product_url, product_data):
+        afficher_entete(ref)
+        if site:
+            print(f"Site : {site}")
+        afficher_resultat(ref, product_url, product_data)
+        resultats.ajouter(ref, product_data)
+
+    try:
+        ordonnanceur.traiter_references(references, afficher)
+    finally:
+        ordonnanceur.fermer()
+        print(resumer(telechargements.fermer()))
+        print(ordonnanceur.resume())
+        resultats.fermer()
+
+    execution_time = time.time() - start_time
+    print(f"\nTemps d'exécution total : {execution_time:.2f} secondes")
+
+
+if __name__ == "__main__":
+    # python -m Model.ordonnanceur [site ...]
+    main(sites=sys.argv[1:] or ('deejay',))
@@ -0,0 +1,267 @@
+# Model/pilotes.py
+# Cycle de vie des Chrome : création, chromedriver en cache, profils
+# réutilisables et pilote de réserve démarré à l'avance.
+
+from seleniumwire import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+from urllib.parse import urlsplit
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from Model.commun import URL_ACCUEIL
+from Model.politique_reseau import POLITIQUE_DEFAUT
+
+
+# Propre à l'utilisateur ; à l'intérieur, chaque slot est verrouillé par le processus qui l'occupe
+DOSSIER_PILOTES = os.path.join(os.path.expanduser("~"), ".pilotes_selenium")
+
+_chromedriver = None
+_verrou_chromedriver = threading.Lock()
+
+
+def chemin_chromedriver():
+    """
+    Le chromedriver posé à côté du module s'il existe, sinon celui que
+    webdriver_manager télécharge une fois puis garde en cache (~/.wdm).
+    """
+    global _chromedriver
+    with _verrou_chromedriver:
+        if _chromedriver is None:
+            chromedriver_path = os.path.join(os.path.dirname(__file__), "chromedriver")
+            if os.name == "nt":
+                chromedriver_path += ".exe"  # Windows
+            if not os.path.isfile(chromedriver_path):
+                chromedriver_path = ChromeDriverManager().install()
+            _chromedriver = chromedriver_path
+        return _chromedriver
+
+
+def setup_driver(dossier_travail=DOSSIER_PILOTES, user_data_dir=None, politique=POLITIQUE_DEFAUT):
+    """
+    Crée un Chrome headless piloté par selenium-wire.
+    Args:
+        dossier_travail (str): dossier propre à ce pilote, utilisé pour le
+            stockage des requêtes selenium-wire et les téléchargements Chrome
+        user_data_dir (str): profil Chrome à réutiliser (cache disque chaud) ;
+            un profil ne peut servir qu'à un Chrome à la fois
+        politique (PolitiqueRessources): ressources bloquées et requêtes
+            capturées ; None pour tout charger et tout capturer
+    """
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_experimental_option("prefs", {"download.default_directory": dossier_travail})
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    if urlsplit(URL_ACCUEIL).hostname in ("localhost", "127.0.0.1"):
+        # Site local (banc d'essai) : sans ça Chrome contourne le proxy selenium-wire
+        options.add_argument("--proxy-bypass-list=<-loopback>")
+
+    seleniumwire_options = {
+        'disable_encoding': True,  # Accélère un peu
+        'request_storage_base_dir': dossier_travail,  # Réduit I/O
+        'request_storage': 'memory',  # Pas d'écriture disque
+    }
+    if politique is not None:
+        politique.configurer_options(options)
+        seleniumwire_options.update(politique.options_seleniumwire())
+
+    driver = webdriver.Chrome(
+        service = Service(executable_path=chemin_chromedriver()),
+        options=options,
+        seleniumwire_options=seleniumwire_options,
+    )
+    if politique is not None:
+        politique.appliquer(driver)
+    return driver
+
+
+def verrouiller(chemin):
+    """
+    Prend un verrou exclusif sur le fichier chemin, sans attendre. Il est
+    libéré à la fermeture du fichier, ou à la mort du processus.
+    Returns:
+        file: fichier à garder ouvert tant que le verrou sert, ou None s'il est déjà pris
+    """
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    fichier = open(chemin, 'a+')
+    try:
+        if fcntl is not None:
+            fcntl.flock(fichier, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            fichier.seek(0)
+            msvcrt.locking(fichier.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        fichier.close()
+        return None
+    return fichier
+
+
+def pilote_vivant(driver):
+    """Vérifie que Chrome répond encore (un crash lève une WebDriverException)."""
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+def quitter_pilote(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class FabriquePilotes:
+    """
+    Distribue des Chrome prêts à l'emploi. Chaque pilote occupe un "slot"
+    (dossier de travail + profil Chrome persistant d'une exécution à l'autre).
+    Un slot n'est pris que si son fichier pilote_N.lock peut être verrouillé :
+    deux processus (ex. le démon et Model.scrap) n'ouvrent jamais le même profil.
+    Les pilotes rendus sont gardés au chaud, et avec reserve=True un pilote
+    supplémentaire est démarré en arrière-plan pour la prochaine demande.
+    """
+
+    def __init__(self, dossier=DOSSIER_PILOTES, reserve=True, politique=POLITIQUE_DEFAUT):
+        self.dossier = dossier
+        self.reserve = reserve
+        self.politique = politique
+        self._verrou = threading.Lock()
+        self._slots_libres = []
+        self._verrous_slots = {}  # slot -> fichier verrou tenu par cette fabrique
+        self._slots = {}  # id(driver) -> slot
+        self._disponibles = []  # Pilotes démarrés et inoccupés
+        self._demarrage = None  # Thread qui démarre le pilote de réserve
+        self._debut = time.perf_counter()
+        self.durees_demarrage = []
+        self.temps_premiere_requete = None
+        if reserve:
+            self.demarrer_reserve()
+
+    def _prendre_slot(self):
+        """Un slot déjà tenu et libre, sinon le premier que personne d'autre n'occupe."""
+        with self._verrou:
+            if self._slots_libres:
+                return self._slots_libres.pop()
+            slot = 0
+            while True:
+                if slot not in self._verrous_slots:
+                    verrou = verrouiller(os.path.join(self.dossier, f"pilote_{slot}.lock"))
+                    if verrou is not None:
+                        self._verrous_slots[slot] = verrou
+                        return slot
+                slot += 1
+
+    def _creer(self):
+        slot = self._prendre_slot()
+        dossier_travail = os.path.join(self.dossier, f"pilote_{slot}")
+        debut = time.perf_counter()
+        try:
+            driver = setup_driver(dossier_travail, os.path.join(dossier_travail, "profil"), self.politique)
+        except Exception:
+            with self._verrou:
+                self._slots_libres.append(slot)
+            raise
+        with self._verrou:
+            self._slots[id(driver)] = slot
+            self.durees_demarrage.append(time.perf_counter() - debut)
+        return driver
+
+    def _preparer_reserve(self):
+        try:
+            driver = self._creer()
+            driver.get("about:blank")  # Premier aller-retour chromedriver/Chrome déjà payé
+        except Exception as e:
+            print(f"Démarrage du pilote de réserve impossible : {str(e)}")
+            return
+        with self._verrou:
+            self._disponibles.append(driver)
+
+    def demarrer_reserve(self):
+        """Démarre un pilote en arrière-plan s'il n'y en a pas déjà un de libre."""
+        with self._verrou:
+            if self._disponibles or (self._demarrage and self._demarrage.is_alive()):
+                return
+            self._demarrage = threading.Thread(target=self._preparer_reserve, daemon=True)
+            self._demarrage.start()
+
+    def obtenir(self):
+        """Renvoie un pilote prêt (réserve ou pilote rendu si possible, sinon un nouveau)."""
+        demarrage = self._demarrage
+        with self._verrou:
+            driver = self._disponibles.pop() if self._disponibles else None
+        if driver is None and demarrage is not None:
+            demarrage.join()  # La réserve est en route : plus rapide que d'en lancer un autre
+            with self._verrou:
+                driver = self._disponibles.pop() if self._disponibles else None
+        if driver is not None and not pilote_vivant(driver):
+            self.jeter(driver)
+            driver = None
+        if driver is None:
+            driver = self._creer()
+
+        with self._verrou:
+            if self.temps_premiere_requete is None:
+                self.temps_premiere_requete = time.perf_counter() - self._debut
+        if self.reserve:
+            self.demarrer_reserve()
+        return driver
+
+    def rendre(self, driver):
+        """Remet un pilote en service dans les pilotes disponibles."""
+        if not pilote_vivant(driver):
+            self.jeter(driver)
+            return
+        driver.requests.clear()
+        with self._verrou:
+            self._disponibles.append(driver)
+
+    def jeter(self, driver):
+        """Ferme un pilote (planté ou en trop) et libère son slot."""
+        quitter_pilote(driver)
+        with self._verrou:
+            slot = self._slots.pop(id(driver), None)
+            if slot is not None:
+                self._slots_libres.append(slot)
+
+    def fermer(self):
+        if self._demarrage is not None:
+            self._demarrage.join()
+        with self._verrou:
+            pilotes, self._disponibles = self._disponibles, []
+        for driver in pilotes:
+            self.jeter(driver)
+        # Slots libres rendus aux autres processus (ceux des pilotes encore prêtés restent tenus)
+        with self._verrou:
+            for slot in self._slots_libres:
+                self._verrous_slots.pop(slot).close()
+            self._slots_libres = []
+
+    def statistiques(self):
+        durees = self.durees_demarrage
+        return {
+            'temps_premiere_requete': self.temps_premiere_requete,
+            'demarrage_moyen': sum(durees) / len(durees) if durees else None,
+            'pilotes_demarres': len(durees),
+        }
+
+    def resume(self):
+        stats = self.statistiques()
+        if stats['temps_premiere_requete'] is None:
+            return "Aucun pilote démarré"
+        return (f"Premier pilote prêt en {stats['temps_premiere_requete']:.2f} s, "
+                f"démarrage moyen {stats['demarrage_moyen']:.2f} s sur {stats['pilotes_demarres']} pilote(s)")
@@ -0,0 +1,227 @@
+# Model/pipeline.py
+# Pipeline asyncio en étages : résolution -> extraction -> téléchargement ->
+# sortie. Des files bornées entre étages assurent la contre-pression, chaque
+# étage a sa propre concurrence et les appels Selenium bloquants tournent
+# dans un exécuteur. Les résultats sortent au fil de l'eau.
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import sys
+import time
+
+from Model.commun import REFERENCES, CollecteurAssets, afficher_entete, afficher_resultat
+from Model.attentes import ATTENTES
+from Model.cache_recherche import CacheRecherche
+from Model.resultats import ResultatsSQLite
+from Model.pilotes import FabriquePilotes, pilote_vivant
+from Model.scrap import extract_main_product_details, get_first_product_link
+from Model.session_navigateur import EtatSession
+from Model.telechargement import creer_session, resumer, telecharger
+
+
+_FIN = object()  # Sentinelle de fin de flux entre deux étages
+
+
+class _Pilote:
+    """Un Chrome et son état de session, propres à un worker d'étage."""
+
+    def __init__(self, fabrique):
+        self.fabrique = fabrique
+        self.driver = None
+        self.session = None
+
+    def obtenir(self):
+        if self.driver is None:
+            self.driver = self.fabrique.obtenir()
+            self.session = EtatSession()
+        return self.driver
+
+    def verifier(self):
+        """Après une erreur : un Chrome planté est remplacé au prochain obtenir()."""
+        if self.driver is not None and not pilote_vivant(self.driver):
+            self.fabrique.jeter(self.driver)
+            self.driver = None
+
+    def rendre(self):
+        if self.driver is not None:
+            self.fabrique.rendre(self.driver)
+            self.driver = None
+
+
+async def _etage(entree, sortie, nb_workers, traiter):
+    """
+    Lance nb_workers consommateurs de entree ; chaque élément traité part dans
+    sortie. Quand tous ont vu la fin du flux, la sentinelle est transmise.
+    """
+    async def worker():
+        while True:
+            element = await entree.get()
+            if element is _FIN:
+                await entree.put(_FIN)  # Pour les autres workers de l'étage
+                return
+            await sortie.put(await traiter(element))
+
+    await asyncio.gather(*(worker() for _ in range(nb_workers)))
+    await sortie.put(_FIN)
+
+
+async def pipeline(references, nb_resolution=2, nb_extraction=2, nb_telechargement=4,
+                   taille_file=8, fabrique=None, cache=None):
+    """
+    Générateur asynchrone : produit un dict par référence dès qu'elle a
+    traversé tous les étages (ordre d'achèvement, pas ordre d'entrée).
+    Args:
+        nb_resolution / nb_extraction (int): Chrome dédiés à chaque étage
+        nb_telechargement (int): téléchargements simultanés
+        taille_file (int): capacité des files entre étages (contre-pression)
+    """
+    boucle = asyncio.get_running_loop()
+    executeur = ThreadPoolExecutor(max_workers=nb_resolution + nb_extraction + nb_telechargement)
+    fabrique_temporaire = fabrique is None
+    if fabrique_temporaire:
+        fabrique = FabriquePilotes(reserve=False)
+    session_http = creer_session(nb_telechargement)
+    pilotes = []
+
+    def bloquant(fonction, *args):
+        return boucle.run_in_executor(executeur, fonction, *args)
+
+    def pilote():
+        p = _Pilote(fabrique)
+        pilotes.append(p)
+        return p
+
+    pilotes_resolution = [pilote() for _ in range(nb_resolution)]
+    pilotes_extraction = [pilote() for _ in range(nb_extraction)]
+
+    def rechercher(p, ref):
+        driver = p.obtenir()
+        if cache is not None:
+            return cache.resoudre(ref, lambda query: get_first_product_link(driver, query, p.session))
+        return get_first_product_link(driver, ref, p.session)
+
+    async def resoudre(element):
+        p = pilotes_resolution.pop()
+        try:
+            element['product_url'] = await bloquant(rechercher, p, element['ref'])
+        except Exception as e:
+            element['erreur'] = f"Recherche : {str(e)}"
+            await bloquant(p.verifier)
+        finally:
+            pilotes_resolution.append(p)
+        return element
+
+    def extraire_avec(p, product_url, ref, collecteur):
+        return extract_main_product_details(p.obtenir(), product_url, ref, collecteur)
+
+    async def extraire(element):
+        if not element['product_url']:
+            return element
+        p = pilotes_extraction.pop()
+        collecteur = CollecteurAssets()
+        try:
+            element['details'] = await bloquant(
+                extraire_avec, p, element['product_url'], element['ref'], collecteur
+            )
+            element['fichiers'] = collecteur.fichiers
+        except Exception as e:
+            element['erreur'] = f"Extraction : {str(e)}"
+        finally:
+            if element['details'] is None:
+                await bloquant(p.verifier)
+            pilotes_extraction.append(p)
+        return element
+
+    semaphore = asyncio.Semaphore(nb_telechargement)
+
+    async def telecharger_un(url, folder_path, filename, headers):
+        async with semaphore:
+            return await bloquant(telecharger, url, folder_path, filename, headers, session_http)
+
+    async def telecharger_tout(element):
+        element['telechargements'] = list(await asyncio.gather(
+            *(telecharger_un(*fichier) for fichier in element.pop('fichiers', []))
+        ))
+        return element
+
+    files = [asyncio.Queue(maxsize=taille_file) for _ in range(4)]
+
+    async def alimenter():
+        for index, ref in enumerate(references):
+            await files[0].put({'index': index, 'ref': ref, 'product_url': None, 'details': None,
+                                'telechargements': [], 'erreur': None})
+        await files[0].put(_FIN)
+
+    taches = [
+        asyncio.ensure_future(alimenter()),
+        asyncio.ensure_future(_etage(files[0], files[1], nb_resolution, resoudre)),
+        asyncio.ensure_future(_etage(files[1], files[2], nb_extraction, extraire)),
+        # Le téléchargement d'une référence ne bloque pas les suivantes
+        asyncio.ensure_future(_etage(files[2], files[3], nb_telechargement, telecharger_tout)),
+    ]
+    try:
+        while True:
+            element = await files[3].get()
+            if element is _FIN:
+                break
+            yield element
+        await asyncio.gather(*taches)
+    finally:
+        for tache in taches:
+            tache.cancel()
+        for p in pilotes:
+            await bloquant(p.rendre)
+        if fabrique_temporaire:
+            await bloquant(fabrique.fermer)
+        executeur.shutdown(wait=False)
+        session_http.close()
+
+
+def executer_pipeline(references, callback=None, **reglages):
+    """
+    Version synchrone : exécute le pipeline et appelle callback(element)
+    au fil de l'eau.
+    Returns:
+        list of dict: les éléments, remis dans l'ordre des références
+    """
+    async def consommer():
+        elements = []
+        async for element in pipeline(references, **reglages):
+            if callback:
+                callback(element)
+            elements.append(element)
+        return sorted(elements, key=lambda e: e['index'])
+
+    return asyncio.run(consommer())
+
+
+def main(references=REFERENCES):
+    start_time = time.time()
+    cache = CacheRecherche()
+    resultats = ResultatsSQLite()
+    statuts = []
+
+    def afficher(element):
+        afficher_entete(element['ref'])
+        if element['erreur']:
+            print(element['erreur'])
+        afficher_resultat(element['ref'], element['product_url'], element['details'])
+        statuts.extend(element['telechargements'])
+        resultats.ajouter(element['ref'], element['details'])
+
+    try:
+        executer_pipeline(references, callback=afficher, cache=cache)
+    finally:
+        cache.sauvegarder()
+        ATTENTES.sauvegarder()
+        resultats.fermer()
+
+    print(resumer(statuts))
+    print(cache.resume())
+    execution_time = time.time() - start_time
+    print(f"\nTemps d'exécution total : {execution_time:.2f} secondes")
+
+
+if __name__ == "__main__":
+    # python -m Model.pipeline [REF ...]
+    main(sys.argv[1:] or REFERENCES)
@@ -0,0 +1,78 @@
+# Model/politique_reseau.py
+# Politique de ressources des Chrome de scraping : on ne charge que ce qui
+# sert (HTML, attributs src des pochettes, MP3) et on ne garde en mémoire
+# selenium-wire que les requêtes MP3.
+
+
+# Polices, vidéos et traqueurs : bloqués par Chrome avant même le proxy
+URLS_BLOQUEES = (
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*facebook.com/tr*", "*hotjar.com*",
+)
+# Hôtes tiers qui ne passent pas du tout par le proxy selenium-wire
+HOTES_EXCLUS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "hotjar.com", "fonts.googleapis.com", "fonts.gstatic.com",
+)
+# Requête MP3 du lecteur (éventuellement avec paramètres) ; aussi attendue par scrap.capturer_mp3
+MOTIF_MP3 = r".*\.mp3(\?.*)?$"
+# Seules les requêtes correspondantes sont stockées dans driver.requests
+URLS_CAPTUREES = (MOTIF_MP3,)
+
+
+class PolitiqueRessources:
+    """
+    Réglages réseau appliqués par setup_driver.
+    Args:
+        urls_bloquees: motifs Network.setBlockedURLs (jokers *)
+        hotes_exclus: hôtes non proxifiés par selenium-wire
+        urls_capturees: regex des requêtes gardées (driver.scopes)
+        bloquer_images: les <img> gardent leur src mais ne sont pas téléchargées par Chrome
+        taille_tampon: nombre max de requêtes gardées en mémoire par selenium-wire
+        chargement_eager: driver.get rend la main dès le DOM prêt (les waits
+            explicites prennent le relais)
+    """
+
+    def __init__(self, urls_bloquees=URLS_BLOQUEES, hotes_exclus=HOTES_EXCLUS,
+                 urls_capturees=URLS_CAPTUREES, bloquer_images=True, taille_tampon=100,
+                 chargement_eager=True):
+        self.urls_bloquees = list(urls_bloquees)
+        self.hotes_exclus = list(hotes_exclus)
+        self.urls_capturees = list(urls_capturees)
+        self.bloquer_images = bloquer_images
+        self.taille_tampon = taille_tampon
+        self.chargement_eager = chargement_eager
+
+    def configurer_options(self, options):
+        """Drapeaux Chrome, à appliquer avant la création du pilote."""
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        if self.bloquer_images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+        if self.chargement_eager:
+            options.page_load_strategy = 'eager'
+
+    def options_seleniumwire(self):
+        return {
+            'request_storage_max_size': self.taille_tampon,
+            'exclude_hosts': self.hotes_exclus,
+        }
+
+    def appliquer(self, driver):
+        """
+        Réglages à poser sur le pilote une fois créé. Le blocage est fait
+        par Chrome (drapeaux, Network.setBlockedURLs) : selenium-wire ne voit
+        que les requêtes de ses scopes (les MP3), pas d'intercepteur Python.
+        """
+        driver.scopes = self.urls_capturees
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.urls_bloquees})
+        except Exception as e:
+            print(f"Blocage réseau Chrome indisponible : {str(e)}")
+
+
+POLITIQUE_DEFAUT = PolitiqueRessources()
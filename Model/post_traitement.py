@@ -0,0 +1,165 @@
+# Model/post_traitement.py
+# Post-traitement des médias pour la boutique : vignettes des pochettes
+# (Pillow) et extraits MP3 coupés et normalisés (pydub + ffmpeg), calculés
+# dans un pool de processus dès qu'un fichier est téléchargé, pendant que le
+# scraping continue. Les sorties sont mises en cache par empreinte SHA-256
+# de la source : un fichier déjà traité n'est pas retraité.
+
+from concurrent.futures import ProcessPoolExecutor
+import importlib.util
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+
+
+CHEMIN_CACHE_MEDIAS = os.path.join(os.getcwd(), ".cache_medias.json")
+TAILLE_VIGNETTE = (300, 300)
+QUALITE_JPEG = 82
+DUREE_EXTRAIT = 30  # secondes
+NIVEAU_CIBLE = -14.0  # dBFS moyen visé pour les extraits
+DOSSIER_VIGNETTES = "vignettes"
+DOSSIER_EXTRAITS = "extraits"
+
+
+# --- Fonctions exécutées dans les processus du pool (dépendances importées sur place) ---
+
+def creer_vignette(source, destination, taille=TAILLE_VIGNETTE, qualite=QUALITE_JPEG):
+    """Redimensionne (proportions gardées) et recompresse une image en JPEG progressif."""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        image.thumbnail(taille, Image.LANCZOS)
+        temporaire = destination + ".tmp"
+        image.save(temporaire, "JPEG", quality=qualite, optimize=True, progressive=True)
+    os.replace(temporaire, destination)
+    return destination
+
+
+def creer_extrait(source, destination, duree=DUREE_EXTRAIT, niveau=NIVEAU_CIBLE):
+    """Coupe le MP3 à duree secondes, avec fondus, et le ramène au niveau cible."""
+    from pydub import AudioSegment
+
+    son = AudioSegment.from_file(source)[:duree * 1000]
+    son = son.apply_gain(niveau - son.dBFS).fade_in(200).fade_out(1000)
+    temporaire = destination + ".tmp"
+    son.export(temporaire, format="mp3", bitrate="128k")
+    os.replace(temporaire, destination)
+    return destination
+
+
+def outils_disponibles():
+    """Returns: dict type de média -> bool (Pillow ; pydub et ffmpeg)"""
+    return {
+        'image': importlib.util.find_spec("PIL") is not None,
+        'audio': importlib.util.find_spec("pydub") is not None and shutil.which("ffmpeg") is not None,
+    }
+
+
+class TraitementMedias:
+    """
+    Étape optionnelle branchée sur GestionnaireTelechargements(rappel=...) :
+    soumettre(statut) est appelé à la fin de chaque téléchargement réussi.
+    Args:
+        nb_processus (int): taille du pool (par défaut le nombre de CPU)
+    """
+
+    def __init__(self, chemin_cache=CHEMIN_CACHE_MEDIAS, nb_processus=None, taille_vignette=TAILLE_VIGNETTE,
+                 qualite=QUALITE_JPEG, duree_extrait=DUREE_EXTRAIT):
+        self.chemin_cache = chemin_cache
+        self.taille_vignette = tuple(taille_vignette)
+        self.qualite = qualite
+        self.duree_extrait = duree_extrait
+        self.outils = outils_disponibles()
+        for type_media, present in self.outils.items():
+            if not present:
+                print(f"Post-traitement {type_media} désactivé : "
+                      f"{'Pillow' if type_media == 'image' else 'pydub/ffmpeg'} absent")
+        # spawn : les workers ne héritent pas des threads Chrome/téléchargement du parent
+        self._pool = ProcessPoolExecutor(max_workers=nb_processus, mp_context=multiprocessing.get_context("spawn"))
+        self._verrou = threading.Lock()
+        self._en_cours = []
+        self.faits = 0
+        self.depuis_cache = 0
+        self.echecs = 0
+        try:
+            with open(chemin_cache, encoding='utf-8') as f:
+                self._cache = json.load(f)
+        except (OSError, ValueError):
+            self._cache = {}
+
+    def _tache(self, fichier):
+        """Returns: (type, fonction, sous-dossier, nom de sortie, réglages) ou None"""
+        nom = os.path.basename(fichier)
+        if nom.lower().endswith((".jpg", ".jpeg", ".png")):
+            return ('image', creer_vignette, DOSSIER_VIGNETTES, os.path.splitext(nom)[0] + ".jpg",
+                    (self.taille_vignette, self.qualite))
+        if nom.lower().endswith(".mp3"):
+            return ('audio', creer_extrait, DOSSIER_EXTRAITS, nom, (self.duree_extrait, NIVEAU_CIBLE))
+        return None
+
+    def soumettre(self, statut):
+        """
+        Rappel de fin de téléchargement (thread de téléchargement, non bloquant).
+        Args:
+            statut (dict): statut renvoyé par telecharger (fichier, sha256, ok...)
+        """
+        tache = self._tache(statut['fichier'])
+        if not statut['ok'] or tache is None or not self.outils[tache[0]]:
+            return
+        type_media, fonction, sous_dossier, nom, reglages = tache
+        source = statut['fichier']
+        dossier = os.path.join(os.path.dirname(source), sous_dossier)
+        os.makedirs(dossier, exist_ok=True)
+        destination = os.path.join(dossier, nom)
+        cle = f"{statut.get('sha256')}:{type_media}:{json.dumps(reglages)}"
+
+        with self._verrou:
+            deja = self._cache.get(cle) if statut.get('sha256') else None
+        if deja and os.path.isfile(deja):
+            # Même source, mêmes réglages : sortie réutilisée (copiée si autre dossier)
+            if os.path.abspath(deja) != os.path.abspath(destination):
+                shutil.copyfile(deja, destination)
+            with self._verrou:
+                self.depuis_cache += 1
+            return
+
+        future = self._pool.submit(fonction, source, destination, *reglages)
+        future.add_done_callback(lambda f: self._fin(f, cle, statut.get('sha256')))
+        with self._verrou:
+            self._en_cours.append(future)
+
+    def _fin(self, future, cle, sha256):
+        with self._verrou:
+            if future.exception() is not None:
+                self.echecs += 1
+                print(f"Post-traitement impossible : {future.exception()}")
+                return
+            self.faits += 1
+            if sha256:
+                self._cache[cle] = future.result()
+
+    def attendre(self):
+        with self._verrou:
+            futures, self._en_cours = self._en_cours, []
+        for f in futures:
+            f.exception()  # Attend sans lever ; l'erreur a été comptée dans _fin
+
+    def sauvegarder(self):
+        with self._verrou:
+            donnees = dict(self._cache)
+        temporaire = self.chemin_cache + ".tmp"
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(donnees, f)
+        os.replace(temporaire, self.chemin_cache)
+
+    def fermer(self):
+        self.attendre()
+        self._pool.shutdown(wait=True)
+        self.sauvegarder()
+
+    def resume(self):
+        return (f"Post-traitement médias : {self.faits} produit(s), {self.depuis_cache} repris du cache, "
+                f"{self.echecs} échec(s)")
@@ -0,0 +1,185 @@
+# Model/resultats.py
+# Stockage structuré des fiches scrapées : SQLite (produits, pistes, assets,
+# lignes fournisseur) avec insertions groupées et upsert par référence,
+# export Parquet optionnel via pyarrow.
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+
+CHEMIN_RESULTATS = os.path.join(os.getcwd(), "resultats.sqlite")
+TAILLE_LOT = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS produits (
+    reference   TEXT PRIMARY KEY,
+    fournisseur TEXT,
+    artiste     TEXT,
+    titre       TEXT,
+    prix        REAL,
+    devise      TEXT,
+    prix_brut   TEXT,
+    description TEXT,
+    url         TEXT,
+    maj         REAL
+);
+CREATE INDEX IF NOT EXISTS idx_produits_fournisseur ON produits(fournisseur);
+
+CREATE TABLE IF NOT EXISTS pistes (
+    reference TEXT NOT NULL REFERENCES produits(reference) ON DELETE CASCADE,
+    position  INTEGER NOT NULL,
+    intitule  TEXT,
+    PRIMARY KEY (reference, position)
+);
+
+CREATE TABLE IF NOT EXISTS assets (
+    reference TEXT NOT NULL REFERENCES produits(reference) ON DELETE CASCADE,
+    type      TEXT NOT NULL,
+    url       TEXT NOT NULL,
+    fichier   TEXT,
+    PRIMARY KEY (reference, url)
+);
+
+CREATE TABLE IF NOT EXISTS lignes_fournisseur (
+    fournisseur TEXT NOT NULL,
+    reference   TEXT NOT NULL,
+    prix        REAL,
+    quantite    INTEGER,
+    poids       REAL,
+    PRIMARY KEY (fournisseur, reference)
+);
+CREATE INDEX IF NOT EXISTS idx_lignes_reference ON lignes_fournisseur(reference);
+"""
+
+DEVISES = {'€': 'EUR', 'EUR': 'EUR', '$': 'USD', 'USD': 'USD', '£': 'GBP', 'GBP': 'GBP'}
+
+
+def parser_prix(texte):
+    """
+    Convertit le texte de span.price ("12,99 €", "€ 12.99", "1.299,00 EUR"...).
+    Returns:
+        tuple: (prix en float ou None, code devise ou None)
+    """
+    if not texte:
+        return None, None
+    devise = next((code for symbole, code in DEVISES.items() if symbole in texte.upper()), None)
+    nombre = re.search(r"\d[\d.,\s]*", texte)
+    if not nombre:
+        return None, devise
+    chiffres = re.sub(r"\s", "", nombre.group()).rstrip(".,")
+    # Le dernier séparateur suivi de 1 ou 2 chiffres est le séparateur décimal
+    decimal = re.search(r"[.,](\d{1,2})$", chiffres)
+    if decimal:
+        entier = re.sub(r"[.,]", "", chiffres[:decimal.start()])
+        return float(f"{entier}.{decimal.group(1)}"), devise
+    return float(re.sub(r"[.,]", "", chiffres)), devise
+
+
+class ResultatsSQLite:
+    """
+    Puits de résultats. ajouter() met en tampon ; les fiches sont écrites par
+    lots de taille_lot dans une seule transaction (et à vider()/fermer()).
+    Utilisable depuis plusieurs threads.
+    """
+
+    def __init__(self, chemin=CHEMIN_RESULTATS, taille_lot=TAILLE_LOT):
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self._verrou = threading.Lock()
+        self._tampon = []
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("PRAGMA foreign_keys=ON")
+        self._connexion.executescript(SCHEMA)
+
+    def ajouter(self, reference, details, fournisseur=None):
+        """Enregistre (ou remplace) la fiche d'une référence ; details=None est ignoré."""
+        if not details:
+            return
+        with self._verrou:
+            self._tampon.append((reference, details, fournisseur))
+            if len(self._tampon) >= self.taille_lot:
+                self._ecrire()
+
+    def _ecrire(self):
+        lot, self._tampon = self._tampon, []
+        if not lot:
+            return
+        maintenant = time.time()
+        with self._connexion:  # Une transaction pour tout le lot
+            for reference, details, fournisseur in lot:
+                prix, devise = parser_prix(details.get('price'))
+                self._connexion.execute(
+                    """INSERT INTO produits (reference, fournisseur, artiste, titre, prix, devise,
+                                             prix_brut, description, url, maj)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(reference) DO UPDATE SET
+                           fournisseur = COALESCE(excluded.fournisseur, produits.fournisseur),
+                           artiste = excluded.artiste, titre = excluded.titre,
+                           prix = excluded.prix, devise = excluded.devise,
+                           prix_brut = excluded.prix_brut, description = excluded.description,
+                           url = excluded.url, maj = excluded.maj""",
+                    (reference, fournisseur, details.get('artist'), details.get('title'), prix, devise,
+                     details.get('price'), details.get('description'), details.get('url'), maintenant),
+                )
+                self._connexion.execute("DELETE FROM pistes WHERE reference = ?", (reference,))
+                self._connexion.executemany(
+                    "INSERT INTO pistes (reference, position, intitule) VALUES (?, ?, ?)",
+                    [(reference, i, piste) for i, piste in enumerate(details.get('tracks', []), 1)],
+                )
+                self._connexion.execute("DELETE FROM assets WHERE reference = ?", (reference,))
+                self._connexion.executemany(
+                    "INSERT OR REPLACE INTO assets (reference, type, url, fichier) VALUES (?, ?, ?, ?)",
+                    [(reference, a['type'], a['url'], os.path.join(reference, a['fichier']))
+                     for a in details.get('assets', [])],
+                )
+
+    def enregistrer_lignes_fournisseur(self, records):
+        """
+        Enregistre les lignes du contrôleur (lancer_script, importer_fichier)
+        pour les joindre aux fiches en SQL plutôt que de rescraper.
+        """
+        lignes = ((r['fournisseur'], r['référence'], r['prix'], r['quantité'], r['poids']) for r in records)
+        with self._verrou, self._connexion:
+            self._connexion.executemany(
+                """INSERT OR REPLACE INTO lignes_fournisseur (fournisseur, reference, prix, quantite, poids)
+                   VALUES (?, ?, ?, ?, ?)""",
+                lignes,
+            )
+
+    def vider(self):
+        with self._verrou:
+            self._ecrire()
+
+    def requete(self, sql, parametres=()):
+        """Exécute une requête de lecture (après avoir vidé le tampon)."""
+        self.vider()
+        with self._verrou:
+            return self._connexion.execute(sql, parametres).fetchall()
+
+    def exporter_parquet(self, dossier):
+        """
+        Exporte chaque table en <dossier>/<table>.parquet.
+        Raises:
+            ImportError: si pyarrow n'est pas installé
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.vider()
+        os.makedirs(dossier, exist_ok=True)
+        with self._verrou:
+            for table in ("produits", "pistes", "assets", "lignes_fournisseur"):
+                curseur = self._connexion.execute(f"SELECT * FROM {table}")
+                colonnes = [c[0] for c in curseur.description]
+                lignes = curseur.fetchall()
+                donnees = {nom: [ligne[k] for ligne in lignes] for k, nom in enumerate(colonnes)}
+                pq.write_table(pa.table(donnees), os.path.join(dossier, f"{table}.parquet"))
+
+    def fermer(self):
+        self.vider()
+        with self._verrou:
+            self._connexion.close()
@@ -1,125 +1,141 @@
-from seleniumwire import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import requests
-from urllib.parse import urljoin
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urljoin, urlsplit
 import os
+import queue
+import sys
+import threading
 import time
 
-
-def setup_driver():
-
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-dev-shm-usage")
-
-    chromedriver_path = os.path.join(os.path.dirname(__file__), "chromedriver")
-    if os.name == "nt":
-        chromedriver_path += ".exe"  # Windows
-    return webdriver.Chrome(
-        service = Service(executable_path=chromedriver_path),
-        options=options,
-        seleniumwire_options={
-            'disable_encoding': True,  # Accélère un peu
-            'request_storage_base_dir': '/tmp/selenium',  # Réduit I/O
-            'request_storage': 'memory',  # Pas d'écriture disque
-        }
-    )
-
-
-def accept_cookies(driver):
+from Model.commun import (
+    INTROUVABLE_SELECTEUR, INTROUVABLE_TEXTE, REFERENCES, URL_ACCUEIL, CollecteurAssets,
+    afficher_entete, afficher_resultat, create_reference_folder, download_file, enregistrer_fichier,
+)
+from Model.attentes import ATTENTES, AUCUN, marqueur_absence
+from Model.cache_recherche import CacheRecherche
+from Model.journal import ECHEC, EN_ATTENTE, JournalTaches
+from Model.mesures import MESURES, profil
+from Model.resultats import ResultatsSQLite
+from Model.pilotes import FabriquePilotes, pilote_vivant, setup_driver
+from Model.politique_reseau import MOTIF_MP3
+from Model.post_traitement import TraitementMedias
+from Model.session_navigateur import EtatSession, accept_cookies
+from Model.telechargement import GestionnaireTelechargements, resumer
+
+
+MAX_ESSAIS_PILOTE = 3  # Nombre de fois qu'une référence est relancée après un crash de Chrome
+TIMEOUT_PISTE = 10  # Délai max (s) d'attente du MP3 après le clic sur une piste
+FICHIER_MESURES = "mesures_scraping"  # .json et .prom (textfile collector Prometheus)
+INTROUVABLE_DEEJAY = marqueur_absence(INTROUVABLE_SELECTEUR, INTROUVABLE_TEXTE)
+
+
+def attendre_element(driver, by, selecteur, phase, ref=None, absence=None, apprendre_depassement=True):
+    """
+    Attente adaptative (Model.attentes) d'un élément, chronométrée sous la
+    phase donnée, qui sert aussi de clé d'apprentissage du délai.
+    Returns:
+        WebElement, ou AUCUN si absence(driver) a signalé qu'il ne viendra pas
+    """
+    with MESURES.phase(phase, ref):
+        return ATTENTES.attendre(driver, by, selecteur, cle=phase, absence=absence,
+                                 apprendre_depassement=apprendre_depassement)
+
+
+def capturer_mp3(driver, timeout=TIMEOUT_PISTE):
+    """
+    Attend la première réponse MP3 capturée par selenium-wire depuis le dernier
+    driver.requests.clear(), au lieu d'un sleep fixe.
+    Returns:
+        str: URL du MP3, ou None si rien n'est arrivé avant le timeout
+    """
     try:
-        WebDriverWait(driver, 5 ).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Accept')]"))
-        ).click()
-    except:
-        pass
-
-
-def download_file(url, folder_path, filename, headers=None):
-    """Télécharge un fichier et le sauvegarde dans le dossier spécifié"""
-    try:
-        response = requests.get(url, stream=True, headers=headers)
-        response.raise_for_status()
-
-        # Vérifie que c'est bien un fichier audio (pas une page HTML)
-        content_type = response.headers.get('Content-Type', '')
-        if 'text/html' in content_type:
-            print(f"Erreur: L'URL {url} retourne du HTML au lieu d'un fichier audio")
-            return False
-
-        file_path = os.path.join(folder_path, filename)
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(1024):
-                f.write(chunk)
-        return True
-    except Exception as e:
-        print(f"Erreur lors du téléchargement de {url}: {str(e)}")
-        return False
-
-
-def get_first_product_link(driver, query):
-    driver.get("https://www.deejay.de")
-    accept_cookies(driver)
+        # wait_for_request ne renvoie que des requêtes ayant déjà une réponse
+        # Même motif que le scope de capture : une URL avec paramètres est aussi reconnue
+        return driver.wait_for_request(MOTIF_MP3, timeout=timeout).url
+    except TimeoutException:
+        return None
 
-    search_box = WebDriverWait(driver, 3).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "input#ftAutocomplete"))
-    )
-    search_box.send_keys(query + Keys.RETURN)
 
+def get_first_product_link(driver, query, session=None, introuvable=INTROUVABLE_DEEJAY):
+    """
+    Args:
+        session (EtatSession): si fourni, cookies et URL de recherche sont
+            réutilisés au lieu de recharger l'accueil à chaque référence
+        introuvable (callable): marqueur de la page « aucun résultat »
+            (Model.attentes.marqueur_absence) ; None = pas de marqueur connu
+    Returns:
+        str: URL du premier produit, ou None si le marqueur « aucun résultat »
+        a été vu (ou, sans marqueur, si aucun produit n'est venu avant le délai)
+    Raises:
+        TimeoutException: avec un marqueur, ni produit ni marqueur avant la fin du délai
+    """
+    if session is None:
+        with MESURES.phase('accueil', query):
+            driver.get(URL_ACCUEIL)
+            accept_cookies(driver)
+
+        search_box = attendre_element(driver, By.CSS_SELECTOR, "input#ftAutocomplete", 'attente_champ_recherche', query)
+        search_box.send_keys(query + Keys.RETURN)
+    else:
+        with MESURES.phase('lancement_recherche', query):
+            session.lancer_recherche(driver, query)
 
-    iframe = WebDriverWait(driver, 3).until(
-        EC.presence_of_element_located((By.XPATH, "//iframe[@id='myIframe']"))
-    )
+    try:
+        iframe = attendre_element(driver, By.XPATH, "//iframe[@id='myIframe']", 'attente_iframe_recherche', query)
+    except TimeoutException:
+        if session is None or not session.gabarit_recherche:
+            raise
+        # L'URL apprise ne mène plus aux résultats : on repasse par le champ de recherche
+        session.oublier_gabarit()
+        return get_first_product_link(driver, query, session, introuvable)
     driver.switch_to.frame(iframe)
 
     try:
-        first_product = WebDriverWait(driver, 3).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "article.product:first-of-type a[href^='/']"))
-        )
-        product_link = first_product.get_attribute('href')
-    except:
+        # Page « aucun résultat » : référence introuvable, sans attendre le délai.
+        # Avec un marqueur, un délai dépassé est levé (page lente, pas une absence) ;
+        # sans marqueur, il vaut absence comme avant, et n'est pas appris.
+        first_product = attendre_element(driver, By.CSS_SELECTOR, "article.product:first-of-type a[href^='/']",
+                                         'attente_premier_produit', query, absence=introuvable,
+                                         apprendre_depassement=introuvable is not None)
+        product_link = first_product.get_attribute('href') if first_product is not AUCUN else None
+    except TimeoutException:
+        if introuvable is not None:
+            raise
         product_link = None
-
-    driver.switch_to.default_content()
+    finally:
+        driver.switch_to.default_content()
+    if session is not None and product_link:
+        session.apprendre_gabarit(driver, query)
     return product_link
 
-def create_reference_folder(reference):
-    """Crée un dossier pour la référence si inexistant"""
-    folder_path = os.path.join(os.getcwd(), reference)
-    if not os.path.exists(folder_path):
-        os.makedirs(folder_path)
-    return folder_path
-
-def extract_main_product_details(driver, product_url,ref):
-    driver.get(product_url)
+def extract_main_product_details(driver, product_url, ref, telechargements=None):
+    """
+    Extrait l'article principal de la page produit.
+    Args:
+        telechargements (GestionnaireTelechargements): si fourni, images et MP3
+            sont mis en file au lieu d'être téléchargés avant la piste suivante
+    """
+    with MESURES.phase('page_produit', ref):
+        driver.get(product_url)
 
 
     try:
-        iframe = WebDriverWait(driver, 3).until(
-            EC.presence_of_element_located((By.XPATH, "//iframe[@id='myIframe']"))
-        )
+        iframe = attendre_element(driver, By.XPATH, "//iframe[@id='myIframe']", 'attente_iframe_produit', ref)
         driver.switch_to.frame(iframe)
 
         # Cibler spécifiquement le PREMIER article seulement
-        main_article = WebDriverWait(driver, 3).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "article.single_product"))
-        )
+        main_article = attendre_element(driver, By.CSS_SELECTOR, "article.single_product", 'attente_article', ref)
         folder_path = create_reference_folder(ref)
 
+        assets = []  # Fichiers de la référence : type, URL source et nom dans le dossier
         image_elements = main_article.find_elements(By.CSS_SELECTOR, "div.cover img[src]")
         for i, img in enumerate(image_elements, 1):
             img_url = img.get_attribute('src')
             if 'l2' in img_url:  # Version basse résolution
                 hi_res_url = img_url.replace('l2', 'xl')  # Version haute résolution
-                download_file(hi_res_url,folder_path ,f"image_{i}.jpg")
+                enregistrer_fichier(telechargements, hi_res_url, folder_path, f"image_{i}.jpg")
+                assets.append({'type': 'image', 'url': hi_res_url, 'fichier': f"image_{i}.jpg"})
 
         track_elements = main_article.find_elements(By.CSS_SELECTOR, "ul.playtrack li a[href^='play/']")
         audio_urls = []
@@ -131,23 +147,23 @@ def extract_main_product_details(driver, product_url,ref):
             driver.requests.clear()
 
             # Clic via JavaScript pour déclencher le player
-            driver.execute_script("arguments[0].click();", track)
-            time.sleep(3)  # Attendre que le son se charge et que les requêtes soient faites
-
-
-
-            # Filtrer toutes les requêtes MP3 faites après le clic
-            mp3_requests = [r for r in driver.requests if r.response and r.url.endswith(".mp3")]
-
-            if mp3_requests:
-                last_mp3 = mp3_requests[-1].url
+            debut_piste = time.perf_counter()
+            with MESURES.phase('capture_mp3', ref):
+                driver.execute_script("arguments[0].click();", track)
+                last_mp3 = capturer_mp3(driver)
+            latence = time.perf_counter() - debut_piste
+
+            if last_mp3:
+                print(f"Piste {i} : MP3 capturé en {latence:.2f} s")
                 audio_urls.append(last_mp3)
+                nom_mp3 = os.path.basename(urlsplit(last_mp3).path)  # Sans les paramètres éventuels
+                assets.append({'type': 'audio', 'url': last_mp3, 'fichier': nom_mp3})
 
-                success = download_file(last_mp3, folder_path, os.path.basename(last_mp3))
+                success = enregistrer_fichier(telechargements, last_mp3, folder_path, nom_mp3)
                 if not success:
                     print(f"Échec du téléchargement de la piste {i}")
             else:
-                print(f" Aucun MP3 détecté pour la piste {i}")
+                print(f" Aucun MP3 détecté pour la piste {i} (après {latence:.2f} s)")
 
 
         description_elem = main_article.find_elements(By.CSS_SELECTOR, "div.description p")
@@ -161,6 +177,7 @@ def extract_main_product_details(driver, product_url,ref):
             'url': product_url,
             'image' : image_elements is not None,
             'audio' : track_elements is not None,
+            'assets': assets,
         }
 
 
@@ -173,36 +190,277 @@ def extract_main_product_details(driver, product_url,ref):
         return None
 
 
-def main():
-    start_time = time.time()
-    driver = setup_driver()
+def traiter_reference(driver, ref, telechargements=None, cache=None, session=None):
+    """
+    Recherche une référence puis extrait l'article principal.
+    Args:
+        cache (CacheRecherche): si fourni, la page de recherche n'est chargée
+            que pour les références absentes ou expirées du cache
+        session (EtatSession): état de navigation propre à ce pilote
+    Returns:
+        tuple: (product_url, product_data), chacun pouvant valoir None
+    """
+    with MESURES.phase('recherche', ref):
+        if cache is not None:
+            product_url = cache.resoudre(ref, lambda query: get_first_product_link(driver, query, session))
+        else:
+            product_url = get_first_product_link(driver, ref, session)
+    if not product_url:
+        return None, None
+    with MESURES.phase('extraction', ref):
+        return product_url, extract_main_product_details(driver, product_url, ref, telechargements)
+
+
+def traiter_reference_journal(driver, ref, journal, telechargements=None, cache=None, session=None):
+    """
+    Comme traiter_reference, mais chaque étape est inscrite au journal et les
+    étapes déjà faites lors d'un lancement précédent ne sont pas refaites
+    (URL produit connue, fiche déjà extraite : seuls les fichiers sont repris).
+    Une erreur est notée dans le journal pour la passe de relance au lieu d'être levée.
+    Returns:
+        tuple: (product_url, product_data), chacun pouvant valoir None
+    """
+    etat, product_url, details = journal.etat(ref)
+    collecteur = CollecteurAssets(telechargements)
     try:
-        references = [ "OTP02","OTP03","OYTVIN04","PI06","POSS-009","POSS-011","PRRUKBLK044","PRRUKBLK053","PRRUKBLK127","PRRUKWHT008","REVENGE4","SOMALP128","SUPERSTYLE001","T3R016","TPTX006","TRI003","VAULTREC006"]
-
-        for ref in references:
-            print(f"\n=== TRAITEMENT DE {ref} ===")
-
-            product_url = get_first_product_link(driver, ref)
-
-            if not product_url:
-                print(f"Aucun produit trouvé pour {ref}")
-                continue
-
-            product_data = extract_main_product_details(driver, product_url,ref)
-
-            if product_data:
-                print(f"Artiste***Titre: {product_data['artist']}***{product_data['title']}")
-                print(f"Description: {product_data['description']}")
-                print("")
-                for i, track in enumerate(product_data['tracks'], 1):
-                    print(f"{i}. {track}")
+        if product_url is None and etat in (EN_ATTENTE, ECHEC):
+            with MESURES.phase('recherche', ref):
+                if cache is not None:
+                    product_url = cache.resoudre(ref, lambda query: get_first_product_link(driver, query, session))
+                else:
+                    product_url = get_first_product_link(driver, ref, session)
+            journal.resolue(ref, product_url)
+        if not product_url:
+            journal.terminee(ref)  # Référence introuvable : rien d'autre à faire
+            return None, None
+
+        if details is None:
+            with MESURES.phase('extraction', ref):
+                details = extract_main_product_details(driver, product_url, ref, collecteur)
+            if details is None:
+                raise RuntimeError("échec extraction article principal")
+            journal.extraite(ref, details)
+        else:
+            # Reprise : la fiche est au journal, on remet ses fichiers en file
+            folder_path = create_reference_folder(ref)
+            for asset in details.get('assets', []):
+                collecteur.ajouter(asset['url'], folder_path, asset['fichier'])
+    except Exception as e:
+        print(f"Erreur sur {ref} (notée au journal) : {str(e)}")
+        journal.echec(ref, e)
+        return product_url, None
+
+    if telechargements is not None:
+        journal.suivre_fichiers(ref, collecteur.futures)
+    else:
+        rates = [f for f in collecteur.fichiers if not download_file(f[0], f[1], f[2])]
+        if rates:
+            journal.echec(ref, f"{len(rates)} fichier(s) non téléchargé(s)")
+        else:
+            journal.terminee(ref)
+    return product_url, details
+
+
+def relancer_echecs(journal, traiter_lot, attendre=None):
+    """
+    Passes de relance après le lot principal : les références en échec sont
+    retraitées une fois leur délai de backoff écoulé, jusqu'à épuisement des essais.
+    Args:
+        traiter_lot (callable): traite une liste de références
+        attendre (callable): appelé avant chaque passe, pour que les
+            téléchargements en vol aient marqué leurs références
+    """
+    while True:
+        if attendre:
+            attendre()
+        journal.attendre_suivis()
+        refs = journal.a_relancer()
+        if not refs:
+            return
+        attente = max(journal.attente_relance(ref) for ref in refs)
+        print(f"\n{len(refs)} référence(s) en échec, relance dans {attente:.0f} s")
+        time.sleep(attente)
+        traiter_lot(refs)
+
+
+def _travailleur(num, file_refs, file_resultats, telechargements, cache, fabrique, journal=None):
+    """
+    Boucle d'un worker du pool : possède son propre Chrome (donc son propre
+    tampon de requêtes selenium-wire) et son propre dossier de travail.
+    Un pilote planté est recyclé et la référence en cours est remise en file.
+    """
+    driver = None
+    while True:
+        tache = file_refs.get()
+        if tache is None:
+            break
+        index, ref, essais = tache
+
+        try:
+            if driver is None:
+                driver = fabrique.obtenir()
+                session = EtatSession()
+            if journal is not None:
+                resultat = traiter_reference_journal(driver, ref, journal, telechargements, cache, session)
             else:
-                print("Échec extraction article principal")
+                resultat = traiter_reference(driver, ref, telechargements, cache, session)
+            erreur = None
+        except Exception as e:
+            resultat = (None, None)
+            erreur = e
+
+        if driver is None or not pilote_vivant(driver):
+            if driver is not None:
+                fabrique.jeter(driver)
+                driver = None
+            if essais < MAX_ESSAIS_PILOTE:
+                print(f"[worker {num}] Chrome planté sur {ref}, relance du pilote")
+                file_refs.put((index, ref, essais + 1))
+                continue
 
-            print("=" * 60)
+        if erreur is not None:
+            print(f"[worker {num}] Erreur sur {ref}: {str(erreur)}")
+        file_resultats.put((index, resultat))
+
+    if driver is not None:
+        fabrique.rendre(driver)
+
+
+def traiter_references_pool(references, nb_workers=None, callback=None, telechargements=None,
+                            cache=None, fabrique=None, journal=None):
+    """
+    Traite les références avec un pool de N Chrome headless alimentés par une
+    file partagée.
+    Args:
+        references (list of str): références à traiter
+        nb_workers (int): nombre de pilotes (par défaut le nombre de CPU)
+        callback (callable): appelé avec (ref, product_url, product_data) dans
+            l'ordre d'origine, dès que le résultat et tous les précédents sont prêts
+        telechargements (GestionnaireTelechargements): file partagée par les workers
+        cache (CacheRecherche): cache de recherche partagé par les workers
+        fabrique (FabriquePilotes): fournit les pilotes (et les garde si elle
+            est partagée, ex. le démon) ; par défaut une fabrique temporaire
+        journal (JournalTaches): si fourni, étapes déjà faites sautées et échecs notés
+    Returns:
+        list of tuple: (product_url, product_data) dans l'ordre des références
+    """
+    nb_workers = max(1, min(nb_workers or os.cpu_count() or 1, len(references) or 1))
+    fabrique_temporaire = fabrique is None
+    if fabrique_temporaire:
+        fabrique = FabriquePilotes(reserve=False)
+    file_refs = queue.Queue()
+    file_resultats = queue.Queue()
+    for index, ref in enumerate(references):
+        file_refs.put((index, ref, 0))
+
+    workers = [
+        threading.Thread(target=_travailleur, args=(num, file_refs, file_resultats, telechargements, cache, fabrique, journal),
+                         daemon=True)
+        for num in range(nb_workers)
+    ]
+    for w in workers:
+        w.start()
+
+    resultats = [None] * len(references)
+    prochain = 0
+    try:
+        for _ in range(len(references)):
+            index, resultat = file_resultats.get()
+            resultats[index] = resultat
+            # Restitution dans l'ordre d'origine
+            while prochain < len(references) and resultats[prochain] is not None:
+                if callback:
+                    callback(references[prochain], *resultats[prochain])
+                prochain += 1
+    finally:
+        for _ in workers:
+            file_refs.put(None)
+        for w in workers:
+            w.join()
+        if fabrique_temporaire:
+            fabrique.fermer()
+
+    return resultats
+
+
+def main(nb_workers=1, post_traitement=False):
+    """
+    Args:
+        nb_workers (int): 1 pour la boucle séquentielle historique, None pour
+            un pool d'autant de Chrome que de CPU, N pour un pool de N Chrome
+        post_traitement (bool): vignettes et extraits MP3 calculés au fil des
+            téléchargements (Model.post_traitement)
+    Le lot est journalisé : relancé après un crash, il reprend aux
+    références non terminées, puis relance les échecs avec backoff.
+    """
+    start_time = time.time()
+    references = REFERENCES
+    medias = TraitementMedias() if post_traitement else None
+    # Les téléchargements se font en arrière-plan pendant les clics suivants
+    telechargements = GestionnaireTelechargements(rappel=medias.soumettre if medias else None)
+    cache = CacheRecherche()
+    resultats = ResultatsSQLite()
+    journal = JournalTaches(references)
+    statuts = []
+
+    a_faire = journal.a_traiter()
+    if len(a_faire) < len(references):
+        print(f"Reprise du lot {journal.lot} : {len(references) - len(a_faire)} référence(s) déjà traitée(s)")
+
+    def afficher(ref, product_url, product_data):
+        afficher_entete(ref)
+        afficher_resultat(ref, product_url, product_data)
+        resultats.ajouter(ref, product_data)
 
+    try:
+        if nb_workers == 1:
+            fabrique = FabriquePilotes(reserve=False)
+            pilote = {'driver': fabrique.obtenir(), 'session': EtatSession()}
+
+            def traiter_lot(refs):
+                for ref in refs:
+                    afficher_entete(ref)
+                    product_url, product_data = traiter_reference_journal(pilote['driver'], ref, journal,
+                                                                          telechargements, cache, pilote['session'])
+                    afficher_resultat(ref, product_url, product_data)
+                    resultats.ajouter(ref, product_data)
+                    if not pilote_vivant(pilote['driver']):
+                        print(f"Chrome planté sur {ref}, relance du pilote")
+                        fabrique.jeter(pilote['driver'])
+                        # Nouveau Chrome, nouvelle session : cookies et bannière à refaire
+                        pilote['driver'] = fabrique.obtenir()
+                        pilote['session'] = EtatSession()
+            try:
+                traiter_lot(a_faire)
+                relancer_echecs(journal, traiter_lot, lambda: statuts.extend(telechargements.attendre()))
+            finally:
+                fabrique.jeter(pilote['driver'])
+                print(fabrique.resume())
+                print(pilote['session'].resume())
+        else:
+            def traiter_lot(refs):
+                traiter_references_pool(refs, nb_workers, callback=afficher,
+                                        telechargements=telechargements, cache=cache, journal=journal)
+
+            traiter_lot(a_faire)
+            relancer_echecs(journal, traiter_lot, lambda: statuts.extend(telechargements.attendre()))
     finally:
-        driver.quit()
+        statuts.extend(telechargements.fermer())
+        print(resumer(statuts))
+        if medias is not None:
+            medias.fermer()
+            print(medias.resume())
+        cache.sauvegarder()
+        print(cache.resume())
+        ATTENTES.sauvegarder()
+        print(ATTENTES.resume())
+        resultats.fermer()
+        print(f"Fiches enregistrées dans {resultats.chemin}")
+        print(journal.resume())
+        journal.fermer()
+        MESURES.exporter_json(FICHIER_MESURES + ".json")
+        MESURES.exporter_prometheus(FICHIER_MESURES + ".prom")
+        print(MESURES.rapport())
 
     end_time = time.time()  # Capturer le temps à la fin
     execution_time = end_time - start_time  # Calculer la durée d'exécution
@@ -210,4 +468,12 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python -m Model.scrap [nb_workers]  (0 = autant de Chrome que de CPU)
+    # SCRAP_PROFIL=cprofile|pyinstrument pour profiler le lot
+    # SCRAP_MEDIAS=1 pour produire vignettes et extraits pendant le scraping
+    post_traitement = os.environ.get("SCRAP_MEDIAS") == "1"
+    with profil(os.environ.get("SCRAP_PROFIL")):
+        if len(sys.argv) > 1:
+            main(int(sys.argv[1]) or None, post_traitement)
+        else:
+            main(post_traitement=post_traitement)
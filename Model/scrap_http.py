@@ -0,0 +1,251 @@
+# Model/scrap_http.py
+# Moteur "léger" : récupère les pages de recherche et l'iframe produit en HTTP
+# (requests.Session mutualisée) et les analyse avec lxml, sans lancer Chrome.
+# Selenium n'est utilisé qu'en repli, quand l'analyse échoue.
+
+from urllib.parse import urljoin
+from lxml import html
+import requests
+import os
+import re
+import sys
+import time
+
+from Model.commun import (
+    INTROUVABLE_SELECTEUR, INTROUVABLE_TEXTE, REFERENCES, URL_ACCUEIL, afficher_entete, afficher_resultat,
+    create_reference_folder, enregistrer_fichier,
+)
+from Model.cache_recherche import CacheRecherche
+from Model.mesures import MESURES
+from Model.resultats import ResultatsSQLite
+from Model.telechargement import (
+    TIMEOUT_HTTP, GestionnaireTelechargements, creer_session, resumer,
+)
+
+
+MP3_REGEX = re.compile(r"""[^"'\s()]+\.mp3\b""")
+
+
+class EchecAnalyse(Exception):
+    """La page n'a pas la structure attendue : il faut repasser par Selenium."""
+
+
+def _charger(session, url, **kwargs):
+    with MESURES.phase('requete_http'):
+        response = session.get(url, timeout=TIMEOUT_HTTP, **kwargs)
+    response.raise_for_status()
+    return html.fromstring(response.content, base_url=response.url)
+
+
+def _texte(element):
+    """Équivalent de WebElement.text : texte visible aux espaces normalisés."""
+    return " ".join(element.text_content().split())
+
+
+def _document_iframe(session, doc):
+    """Renvoie le contenu de l'iframe myIframe, ou la page elle-même s'il n'y en a pas."""
+    iframes = doc.xpath("//iframe[@id='myIframe']/@src")
+    if iframes and iframes[0].strip():
+        return _charger(session, urljoin(doc.base_url, iframes[0]))
+    return doc
+
+
+def get_first_product_link_http(session, query):
+    """
+    Version HTTP de get_first_product_link : soumet le formulaire de
+    recherche de la page d'accueil et lit le premier article de l'iframe.
+    Returns:
+        str: URL absolue du premier produit, ou None s'il n'y a pas de résultat
+        (page portant le marqueur « aucun résultat » de Model.commun, ou
+        page sans produit si aucun marqueur n'est configuré)
+    Raises:
+        EchecAnalyse: si le formulaire est introuvable, ou si un marqueur est
+            configuré et que la page n'a ni produit ni marqueur (résultats
+            peut-être ajoutés par JS : repli Selenium)
+    """
+    accueil = _charger(session, URL_ACCUEIL)
+
+    champs = accueil.cssselect("input#ftAutocomplete")
+    if not champs:
+        raise EchecAnalyse("champ de recherche introuvable")
+    champ = champs[0]
+    formulaires = list(champ.iterancestors("form"))
+    if not formulaires or not champ.get("name"):
+        raise EchecAnalyse("formulaire de recherche introuvable")
+    formulaire = formulaires[0]
+
+    params = {
+        i.get("name"): i.get("value", "")
+        for i in formulaire.xpath(".//input[@type='hidden'][@name]")
+    }
+    params[champ.get("name")] = query
+    action = urljoin(accueil.base_url, formulaire.get("action") or "")
+    if (formulaire.get("method") or "get").lower() == "post":
+        response = session.post(action, data=params, timeout=TIMEOUT_HTTP)
+        response.raise_for_status()
+        resultats = html.fromstring(response.content, base_url=response.url)
+    else:
+        resultats = _charger(session, action, params=params)
+
+    resultats = _document_iframe(session, resultats)
+    liens = resultats.cssselect("article.product:first-of-type a[href^='/']")
+    if liens:
+        # get_attribute('href') de Selenium renvoie l'URL absolue
+        return urljoin(resultats.base_url, liens[0].get("href"))
+    if not (INTROUVABLE_SELECTEUR or INTROUVABLE_TEXTE):
+        return None  # Pas de marqueur : page sans produit = introuvable
+    if ((INTROUVABLE_SELECTEUR and resultats.cssselect(INTROUVABLE_SELECTEUR))
+            or (INTROUVABLE_TEXTE and INTROUVABLE_TEXTE in resultats.text_content())):
+        return None
+    raise EchecAnalyse("ni produit ni marqueur « aucun résultat » dans la page")
+
+
+def extract_main_product_details_http(session, product_url, ref, telechargements=None):
+    """
+    Version HTTP de extract_main_product_details : même dictionnaire details.
+    Les MP3 ne sont récupérables que s'ils figurent en clair dans le HTML.
+    Raises:
+        EchecAnalyse: article introuvable, ou pistes sans URL MP3 exploitable
+    """
+    doc = _document_iframe(session, _charger(session, product_url))
+
+    articles = doc.cssselect("article.single_product")
+    if not articles:
+        raise EchecAnalyse("article.single_product introuvable")
+    main_article = articles[0]
+
+    def unique(selecteur):
+        elements = main_article.cssselect(selecteur)
+        if not elements:
+            raise EchecAnalyse(f"{selecteur} introuvable")
+        return _texte(elements[0])
+
+    track_elements = main_article.cssselect("ul.playtrack li a[href^='play/']")
+    # Le lecteur JS construit normalement l'URL du MP3 : sans elle, on passe la main à Selenium
+    audio_urls = []
+    for url in MP3_REGEX.findall(html.tostring(main_article, encoding="unicode")):
+        url = urljoin(doc.base_url, url)
+        if url not in audio_urls:
+            audio_urls.append(url)
+    if len(audio_urls) < len(track_elements):
+        raise EchecAnalyse("URL MP3 absentes du HTML")
+
+    description_elem = main_article.cssselect("div.description p")
+    details = {
+        'artist': unique("div.artist"),
+        'title': unique("div.title"),
+        'price': unique("span.price"),
+        "tracks": [_texte(t) for t in main_article.cssselect("ul.playtrack li")],
+        'description': _texte(description_elem[0]) if description_elem else "",
+        'url': product_url,
+        'image': True,
+        'audio': True,
+        'assets': [],
+    }
+
+    folder_path = create_reference_folder(ref)
+    image_elements = main_article.cssselect("div.cover img[src]")
+    for i, img in enumerate(image_elements, 1):
+        img_url = urljoin(doc.base_url, img.get("src"))
+        if 'l2' in img_url:  # Version basse résolution
+            hi_res_url = img_url.replace('l2', 'xl')  # Version haute résolution
+            enregistrer_fichier(telechargements, hi_res_url, folder_path, f"image_{i}.jpg", session)
+            details['assets'].append({'type': 'image', 'url': hi_res_url, 'fichier': f"image_{i}.jpg"})
+
+    for i, last_mp3 in enumerate(audio_urls, 1):
+        success = enregistrer_fichier(telechargements, last_mp3, folder_path, os.path.basename(last_mp3), session)
+        details['assets'].append({'type': 'audio', 'url': last_mp3, 'fichier': os.path.basename(last_mp3)})
+        if not success:
+            print(f"Échec du téléchargement de la piste {i}")
+
+    return details
+
+
+class MoteurLeger:
+    """
+    Traite les références en HTTP et ne démarre un Chrome (une seule fois,
+    paresseusement) que pour celles dont l'analyse légère échoue.
+    """
+
+    def __init__(self, session=None, telechargements=None, cache=None):
+        self.session = session or creer_session()
+        self.telechargements = telechargements
+        self.cache = cache
+        self.driver = None
+        self.nb_replis = 0
+
+    def _driver(self):
+        if self.driver is None:
+            from Model.scrap import setup_driver
+            self.driver = setup_driver()
+        return self.driver
+
+    def traiter_reference(self, ref):
+        """Returns: (product_url, product_data), comme scrap.traiter_reference."""
+        try:
+            with MESURES.phase('recherche_http', ref):
+                if self.cache is not None:
+                    product_url = self.cache.resoudre(ref, lambda query: get_first_product_link_http(self.session, query))
+                else:
+                    product_url = get_first_product_link_http(self.session, ref)
+        except (EchecAnalyse, requests.RequestException) as e:
+            print(f"Recherche HTTP impossible pour {ref} ({e}), repli Selenium")
+            self.nb_replis += 1
+            from Model.scrap import traiter_reference
+            return traiter_reference(self._driver(), ref, self.telechargements, self.cache)
+
+        if not product_url:
+            return None, None
+        return product_url, self.traiter_url(product_url, ref)
+
+    def traiter_url(self, product_url, ref):
+        """Extrait une page produit déjà connue. Returns: product_data ou None"""
+        try:
+            with MESURES.phase('extraction_http', ref):
+                return extract_main_product_details_http(self.session, product_url, ref, self.telechargements)
+        except (EchecAnalyse, requests.RequestException) as e:
+            print(f"Extraction HTTP impossible pour {ref} ({e}), repli Selenium")
+            self.nb_replis += 1
+            from Model.scrap import extract_main_product_details
+            return extract_main_product_details(self._driver(), product_url, ref, self.telechargements)
+
+    def fermer(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+        self.session.close()
+
+
+def main(references=REFERENCES):
+    start_time = time.time()
+    telechargements = GestionnaireTelechargements()
+    cache = CacheRecherche()
+    moteur = MoteurLeger(telechargements=telechargements, cache=cache)
+    resultats = ResultatsSQLite()
+    try:
+        for ref in references:
+            afficher_entete(ref)
+            try:
+                product_url, product_data = moteur.traiter_reference(ref)
+            except Exception as e:
+                # Ex. délai dépassé dans le repli Selenium : la référence suivante est quand même traitée
+                print(f"Erreur sur {ref}: {str(e)}")
+                product_url, product_data = None, None
+            afficher_resultat(ref, product_url, product_data)
+            resultats.ajouter(ref, product_data)
+    finally:
+        print(resumer(telechargements.fermer()))
+        moteur.fermer()
+        cache.sauvegarder()
+        print(cache.resume())
+        resultats.fermer()
+        print(MESURES.rapport())
+
+    execution_time = time.time() - start_time
+    print(f"\nTemps d'exécution total : {execution_time:.2f} secondes")
+    print(f"Replis Selenium : {moteur.nb_replis}/{len(references)}")
+
+
+if __name__ == "__main__":
+    # python -m Model.scrap_http [REF ...]
+    main(sys.argv[1:] or REFERENCES)
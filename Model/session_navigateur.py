@@ -0,0 +1,126 @@
+# Model/session_navigateur.py
+# État de session d'un pilote Chrome : bannière cookies acceptée une seule
+# fois, cookies persistés sur disque et URL de recherche apprise pour aller
+# directement aux résultats sans repasser par la page d'accueil.
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from urllib.parse import quote, quote_plus
+import json
+import os
+import threading
+import time
+
+from Model.attentes import ATTENTES, AUCUN
+from Model.commun import URL_ACCUEIL
+
+
+CHEMIN_SESSION = os.path.join(os.getcwd(), ".session_deejay.json")
+MARQUEUR_REQUETE = "{query}"
+
+_verrou_fichier = threading.Lock()
+
+
+def accept_cookies(driver):
+    try:
+        # 5 s tant que rien n'est appris ; une bannière absente ne fait pas monter le délai
+        bouton = ATTENTES.attendre(
+            driver, By.XPATH, "//button[contains(., 'Accept')]", cle='bouton_cookies',
+            condition=lambda e: e.is_displayed() and e.is_enabled(), defaut=5, apprendre_depassement=False,
+        )
+        if bouton is not AUCUN:
+            bouton.click()
+    except:
+        pass
+
+
+class EtatSession:
+    """
+    Un objet par pilote. Le fichier de session (cookies + gabarit d'URL de
+    recherche) est partagé entre pilotes et entre exécutions.
+    """
+
+    def __init__(self, chemin=CHEMIN_SESSION):
+        self.chemin = chemin
+        self.pret = False
+        self.surcouts = []  # Temps de navigation avant chaque recherche (s)
+        try:
+            with open(chemin, encoding='utf-8') as f:
+                donnees = json.load(f)
+        except (OSError, ValueError):
+            donnees = {}
+        self.cookies = donnees.get('cookies') or []
+        self.gabarit_recherche = donnees.get('gabarit_recherche')
+
+    def _sauvegarder(self):
+        with _verrou_fichier:
+            temporaire = self.chemin + ".tmp"
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump({'cookies': self.cookies, 'gabarit_recherche': self.gabarit_recherche}, f)
+            os.replace(temporaire, self.chemin)
+
+    def _preparer(self, driver):
+        """
+        Première visite du pilote : cookies restaurés du disque, sinon bannière acceptée.
+        Returns:
+            bool: True si l'accueil ouvert est utilisable tel quel (bannière
+            acceptée) ; False si des cookies ont été restaurés et qu'il faut
+            recharger la page pour qu'ils s'appliquent
+        """
+        driver.get(URL_ACCUEIL)
+        restaures = 0
+        for cookie in self.cookies:
+            try:
+                driver.add_cookie(cookie)
+                restaures += 1
+            except Exception:
+                pass
+        if not restaures:
+            accept_cookies(driver)
+            self.cookies = driver.get_cookies()
+            self._sauvegarder()
+        self.pret = True
+        return not restaures
+
+    def lancer_recherche(self, driver, query):
+        """
+        Amène le pilote sur la page de résultats de query : directement par
+        l'URL apprise si on la connaît, sinon par le champ de recherche de
+        l'accueil (sans attendre à nouveau la bannière cookies).
+        """
+        debut = time.perf_counter()
+        accueil_ouvert = False
+        if not self.pret:
+            accueil_ouvert = self._preparer(driver)
+
+        if self.gabarit_recherche:
+            driver.get(self.gabarit_recherche.replace(MARQUEUR_REQUETE, quote(query)))
+        else:
+            if not accueil_ouvert:
+                driver.get(URL_ACCUEIL)
+            search_box = ATTENTES.attendre(driver, By.CSS_SELECTOR, "input#ftAutocomplete",
+                                           cle='attente_champ_recherche')
+            search_box.send_keys(query + Keys.RETURN)
+        self.surcouts.append(time.perf_counter() - debut)
+
+    def apprendre_gabarit(self, driver, query):
+        """Après une recherche réussie, déduit le gabarit d'URL si la requête apparaît dans l'URL."""
+        if self.gabarit_recherche:
+            return
+        url = driver.current_url
+        for encodee in (quote(query), quote_plus(query)):
+            if encodee and encodee in url and url.rstrip('/') != URL_ACCUEIL.rstrip('/'):
+                self.gabarit_recherche = url.replace(encodee, MARQUEUR_REQUETE, 1)
+                self._sauvegarder()
+                return
+
+    def oublier_gabarit(self):
+        """Le gabarit n'a pas mené aux résultats : retour au champ de recherche."""
+        self.gabarit_recherche = None
+        self._sauvegarder()
+
+    def resume(self):
+        if not self.surcouts:
+            return "Surcoût de navigation par recherche : n/a"
+        moyenne = sum(self.surcouts) / len(self.surcouts)
+        return f"Surcoût de navigation par recherche : {moyenne:.2f} s en moyenne sur {len(self.surcouts)}"
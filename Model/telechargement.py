@@ -0,0 +1,221 @@
+# Model/telechargement.py
+# Téléchargement des images et MP3 : session HTTP keep-alive partagée,
+# transferts concurrents bornés par hôte et file non bloquante.
+
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+import requests
+import hashlib
+import os
+import threading
+import time
+
+from Model.depot import depot
+from Model.manifeste import manifeste
+from Model.mesures import MESURES
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+TIMEOUT_HTTP = 10
+
+CHUNK_MIN = 64 * 1024
+CHUNK_MAX = 1024 * 1024
+CHUNK_DEFAUT = 256 * 1024  # Taille inconnue (pas de Content-Length)
+
+
+def creer_session(taille_pool=10):
+    """Session HTTP keep-alive, réutilisable par plusieurs threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=taille_pool, pool_maxsize=taille_pool, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en"})
+    return session
+
+
+def taille_chunk(content_length):
+    """Chunk adaptatif : ~1/16e du fichier, borné entre 64 Kio et 1 Mio."""
+    if not content_length:
+        return CHUNK_DEFAUT
+    return max(CHUNK_MIN, min(CHUNK_MAX, int(content_length) // 16))
+
+
+def _entetes_conditionnels(entree):
+    entetes = {}
+    if entree.get('etag'):
+        entetes['If-None-Match'] = entree['etag']
+    if entree.get('last_modified'):
+        entetes['If-Modified-Since'] = entree['last_modified']
+    return entetes
+
+
+def telecharger(url, folder_path, filename, headers=None, session=None, stockage=None):
+    """
+    Télécharge un fichier et le sauvegarde dans le dossier spécifié.
+    Idempotent grâce au manifeste du dossier : un fichier complet n'est
+    redemandé qu'en requête conditionnelle (304 = rien à faire) et un
+    fichier .part interrompu est repris avec un en-tête Range.
+    Le contenu est rangé dans le dépôt adressé par contenu et le dossier
+    n'en reçoit qu'un lien ; une URL déjà dans le dépôt n'est pas redemandée.
+    Args:
+        stockage (DepotContenu): dépôt à utiliser (par défaut Model.depot.depot())
+    Returns:
+        dict: statut du fichier (url, fichier, ok, inchange, repris, dedoublonne,
+        octets, duree, sha256, erreur)
+    """
+    stockage = stockage or depot()
+    file_path = os.path.join(folder_path, filename)
+    partiel = file_path + ".part"
+    index = manifeste(folder_path)
+    entree = index.lire(filename) or {}
+    statut = {'url': url, 'fichier': file_path, 'ok': False, 'inchange': False, 'repris': False,
+              'dedoublonne': False, 'octets': 0, 'duree': 0.0, 'sha256': None, 'erreur': None}
+    entetes = dict(headers or {})
+    deja_recu = 0
+
+    if index.est_complet(filename, url):
+        entetes.update(_entetes_conditionnels(entree))
+    elif entree.get('url') == url and os.path.isfile(partiel) and (entree.get('etag') or entree.get('last_modified')):
+        deja_recu = os.path.getsize(partiel)
+        entetes['Range'] = f"bytes={deja_recu}-"
+        entetes['If-Range'] = entree.get('etag') or entree['last_modified']
+    else:
+        connu = stockage.chercher(url)
+        if connu:
+            # Même URL déjà téléchargée pour une autre référence : simple lien, aucune requête
+            stockage.lier(connu['sha256'], file_path)
+            index.ecrire(filename, url=url, **connu)
+            statut.update(ok=True, dedoublonne=True, sha256=connu['sha256'])
+            return statut
+
+    debut = time.perf_counter()
+    try:
+        response = (session or requests).get(url, stream=True, headers=entetes, timeout=TIMEOUT_HTTP)
+        if response.status_code == 304:
+            statut['ok'] = statut['inchange'] = True
+            statut['sha256'] = entree.get('sha256')
+            return statut
+        response.raise_for_status()
+
+        # Vérifie que c'est bien un fichier audio (pas une page HTML)
+        content_type = response.headers.get('Content-Type', '')
+        if 'text/html' in content_type:
+            print(f"Erreur: L'URL {url} retourne du HTML au lieu d'un fichier audio")
+            statut['erreur'] = "HTML reçu"
+            return statut
+
+        empreinte = hashlib.sha256()
+        if response.status_code == 206 and deja_recu:
+            statut['repris'] = True
+            with open(partiel, 'rb') as f:
+                for bloc in iter(lambda: f.read(CHUNK_MAX), b''):
+                    empreinte.update(bloc)
+            mode = 'ab'
+        else:
+            deja_recu = 0
+            mode = 'wb'
+
+        longueur = response.headers.get('Content-Length')
+        index.ecrire(
+            filename, url=url, sha256=None,
+            taille=deja_recu + int(longueur) if longueur else None,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+
+        with open(partiel, mode) as f:
+            for bloc in response.iter_content(taille_chunk(longueur)):
+                f.write(bloc)
+                empreinte.update(bloc)
+                statut['octets'] += len(bloc)
+        statut['sha256'] = empreinte.hexdigest()
+        stockage.importer(partiel, statut['sha256'], file_path)
+        taille = os.path.getsize(file_path)
+        stockage.enregistrer_url(url, statut['sha256'], taille, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'))
+        index.ecrire(filename, taille=taille, sha256=statut['sha256'])
+        statut['ok'] = True
+    except Exception as e:
+        print(f"Erreur lors du téléchargement de {url}: {str(e)}")
+        statut['erreur'] = str(e)
+    finally:
+        statut['duree'] = time.perf_counter() - debut
+        # Le dossier porte le nom de la référence
+        MESURES.observer('telechargement', statut['duree'], os.path.basename(folder_path),
+                         statut['octets'], erreur=not statut['ok'])
+    return statut
+
+
+class GestionnaireTelechargements:
+    """
+    File de téléchargements concurrents.
+    ajouter() rend la main immédiatement ; attendre() sert de point de
+    synchronisation et renvoie le statut de chaque fichier.
+    Args:
+        rappel (callable): appelé avec le statut de chaque fichier dès la fin
+            de son téléchargement, depuis le thread qui l'a téléchargé
+            (ex. TraitementMedias.soumettre)
+    """
+
+    def __init__(self, max_par_hote=4, max_total=16, session=None, rappel=None):
+        self.session = session or creer_session(max_total)
+        self.rappel = rappel
+        self.max_par_hote = max_par_hote
+        self._executor = ThreadPoolExecutor(max_workers=max_total, thread_name_prefix="telechargement")
+        self._semaphores = {}
+        self._verrou = threading.Lock()
+        self._en_cours = []
+
+    def _semaphore(self, url):
+        hote = urlsplit(url).netloc
+        with self._verrou:
+            if hote not in self._semaphores:
+                self._semaphores[hote] = threading.BoundedSemaphore(self.max_par_hote)
+            return self._semaphores[hote]
+
+    def _executer(self, url, folder_path, filename, headers):
+        with self._semaphore(url):
+            statut = telecharger(url, folder_path, filename, headers, self.session)
+        if self.rappel is not None:
+            try:
+                self.rappel(statut)
+            except Exception as e:
+                print(f"Erreur du rappel de fin de téléchargement : {str(e)}")
+        return statut
+
+    def ajouter(self, url, folder_path, filename, headers=None):
+        """Met un fichier en file sans attendre. Returns: concurrent.futures.Future"""
+        future = self._executor.submit(self._executer, url, folder_path, filename, headers)
+        with self._verrou:
+            self._en_cours.append(future)
+        return future
+
+    def attendre(self):
+        """
+        Attend la fin de tous les fichiers mis en file depuis le dernier appel.
+        Returns:
+            list of dict: statuts, dans l'ordre d'ajout
+        """
+        with self._verrou:
+            futures, self._en_cours = self._en_cours, []
+        return [f.result() for f in futures]
+
+    def fermer(self):
+        statuts = self.attendre()
+        self._executor.shutdown(wait=True)
+        self.session.close()
+        return statuts
+
+
+def resumer(statuts):
+    """Ligne de synthèse d'une liste de statuts renvoyée par attendre()."""
+    ok = sum(1 for s in statuts if s['ok'])
+    inchanges = sum(1 for s in statuts if s['inchange'])
+    dedoublonnes = sum(1 for s in statuts if s.get('dedoublonne'))
+    octets = sum(s['octets'] for s in statuts)
+    return (f"Téléchargements : {ok}/{len(statuts)} réussis dont {inchanges} inchangés "
+            f"et {dedoublonnes} déjà dans le dépôt, {octets / 1e6:.1f} Mo transférés")
@@ -0,0 +1,215 @@
+# View/grille_virtuelle.py
+# Grille de saisie virtualisée : les données vivent dans un magasin en
+# colonnes et seules les lignes visibles ont des widgets tk.Entry, recyclés
+# au défilement. Des milliers de lignes restent fluides.
+
+import tkinter as tk
+
+HIGHLIGHT_BG = '#ffcdd2'
+MASQUE_COMPLET = 0b1111
+COLONNES = ["Référence", "Prix", "Quantité", "Poids"]
+
+
+def est_decimal(texte):
+    try:
+        float(texte)
+        return True
+    except ValueError:
+        return False
+
+
+def masque_validite(ref_str, prix_str, qte_str, poids_str):
+    """Validité des 4 champs d'une ligne sous forme de masque (bit j = colonne j valide)."""
+    valid_ref   = bool(ref_str and ref_str.isalnum())
+    valid_prix  = est_decimal(prix_str)
+    valid_qte   = qte_str.isdigit() and bool(qte_str)
+    valid_poids = est_decimal(poids_str)
+    return valid_ref | valid_prix << 1 | valid_qte << 2 | valid_poids << 3
+
+
+class MagasinLignes:
+    """
+    Données de la grille, une liste de textes par colonne, avec le masque de
+    validité de chaque ligne et le nombre de lignes invalides tenu à jour.
+    """
+
+    def __init__(self):
+        self.colonnes = [[] for _ in COLONNES]
+        self.validite = bytearray()
+        self.nb_invalides = 0
+
+    def __len__(self):
+        return len(self.validite)
+
+    def redimensionner(self, nb):
+        """Vide le magasin et crée nb lignes vides (donc invalides)."""
+        self.colonnes = [[''] * nb for _ in COLONNES]
+        self.validite = bytearray(nb)
+        self.nb_invalides = nb
+
+    def ajouter(self, valeurs):
+        for colonne, valeur in zip(self.colonnes, valeurs):
+            colonne.append(str(valeur).strip())
+        self.validite.append(0)
+        self.nb_invalides += 1
+        self.valider(len(self.validite) - 1)
+
+    def valeur(self, i, j):
+        return self.colonnes[j][i]
+
+    def definir(self, i, j, valeur):
+        self.colonnes[j][i] = valeur.strip()
+
+    def valider(self, i):
+        """Revalide la ligne i. Returns: le masque de validité."""
+        masque = masque_validite(*(colonne[i] for colonne in self.colonnes))
+        etait_valide = self.validite[i] == MASQUE_COMPLET
+        est_valide = masque == MASQUE_COMPLET
+        if etait_valide != est_valide:
+            self.nb_invalides += -1 if est_valide else 1
+        self.validite[i] = masque
+        return masque
+
+    def surlignage(self, i):
+        """Champs à surligner : invalides et non vides."""
+        masque = 0
+        for j, colonne in enumerate(self.colonnes):
+            if colonne[i] and not self.validite[i] >> j & 1:
+                masque |= 1 << j
+        return masque
+
+    def lignes(self):
+        """Itère sur les lignes (référence, prix, quantité, poids) en texte."""
+        return zip(*self.colonnes)
+
+
+class GrilleVirtuelle(tk.Frame):
+    """
+    Affiche un MagasinLignes avec nb_visibles lignes de tk.Entry. Le
+    défilement réaffecte ces widgets à d'autres indices du magasin.
+    Args:
+        on_change (callable): appelé après chaque revalidation (état du bouton)
+        delai_validation (int): anti-rebond en ms entre la frappe et la revalidation
+    """
+
+    def __init__(self, parent, magasin, nb_visibles=20, on_change=None, delai_validation=150, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.magasin = magasin
+        self.on_change = on_change
+        self.delai_validation = delai_validation
+        self.premiere = 0
+        self._a_valider = set()
+        self._planifie = None
+
+        for j, h in enumerate(COLONNES):
+            tk.Label(self, text=h, font=('Arial', 10, 'bold')).grid(row=0, column=j + 1, padx=5, pady=2)
+
+        self.numeros = []
+        self.entries = []
+        self.fonds = []  # Fond affiché par chaque Entry, pour ne reconfigurer qu'en cas de changement
+        for v in range(nb_visibles):
+            numero = tk.Label(self, width=6, anchor='e', fg='grey')
+            numero.grid(row=v + 1, column=0)
+            self.numeros.append(numero)
+            ligne = []
+            for j in range(len(COLONNES)):
+                ent = tk.Entry(self, width=15)
+                ent.grid(row=v + 1, column=j + 1, padx=5, pady=2)
+                ent.default_bg = ent.cget('bg')
+                ent.bind("<KeyRelease>", lambda e, v=v, j=j: self._saisie(v, j))
+                ent.bind("<MouseWheel>", self._molette)
+                ent.bind("<Button-4>", lambda e: self.defiler(-3))
+                ent.bind("<Button-5>", lambda e: self.defiler(3))
+                ligne.append(ent)
+            self.entries.append(ligne)
+            self.fonds.append([ent.default_bg for ent in ligne])
+
+        self.scrollbar = tk.Scrollbar(self, orient='vertical', command=self._scrollbar)
+        self.scrollbar.grid(row=1, column=len(COLONNES) + 1, rowspan=nb_visibles, sticky='ns')
+        self.bind("<MouseWheel>", self._molette)
+        self.rafraichir()
+
+    # --- Défilement ---
+
+    def _scrollbar(self, action, *args):
+        if action == 'moveto':
+            self.aller_a(int(float(args[0]) * len(self.magasin)))
+        elif action == 'scroll':
+            pas = int(args[0]) * (len(self.entries) if args[1] == 'pages' else 1)
+            self.defiler(pas)
+
+    def _molette(self, event):
+        self.defiler(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def defiler(self, pas):
+        self.aller_a(self.premiere + pas)
+
+    def aller_a(self, premiere):
+        premiere = max(0, min(premiere, len(self.magasin) - len(self.entries)))
+        if premiere != self.premiere:
+            self.premiere = premiere
+            self.rafraichir()
+
+    # --- Affichage ---
+
+    def _peindre(self, v):
+        i = self.premiere + v
+        surligne = self.magasin.surlignage(i) if i < len(self.magasin) else 0
+        for j, ent in enumerate(self.entries[v]):
+            fond = HIGHLIGHT_BG if surligne >> j & 1 else ent.default_bg
+            if fond != self.fonds[v][j]:
+                ent.configure(bg=fond)
+                self.fonds[v][j] = fond
+
+    def rafraichir(self):
+        """Réaffecte les widgets visibles aux lignes premiere..premiere+nb_visibles."""
+        total = len(self.magasin)
+        self.premiere = max(0, min(self.premiere, total - len(self.entries)))
+        for v, ligne in enumerate(self.entries):
+            i = self.premiere + v
+            actif = i < total
+            self.numeros[v].configure(text=str(i + 1) if actif else "")
+            for j, ent in enumerate(ligne):
+                ent.configure(state='normal')
+                ent.delete(0, 'end')
+                if actif:
+                    ent.insert(0, self.magasin.valeur(i, j))
+                else:
+                    ent.configure(state='disabled')
+            self._peindre(v)
+        if total:
+            self.scrollbar.set(self.premiere / total, min(1.0, (self.premiere + len(self.entries)) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- Saisie ---
+
+    def _saisie(self, v, j):
+        i = self.premiere + v
+        if i >= len(self.magasin):
+            return
+        self.magasin.definir(i, j, self.entries[v][j].get())
+        # Anti-rebond : la ligne est revalidée quand la frappe marque une pause
+        self._a_valider.add(i)
+        if self._planifie is not None:
+            self.after_cancel(self._planifie)
+        self._planifie = self.after(self.delai_validation, self._valider_en_attente)
+
+    def valider_maintenant(self):
+        """Applique tout de suite les validations retardées par l'anti-rebond (avant un lancement)."""
+        if self._planifie is not None:
+            self.after_cancel(self._planifie)
+        self._valider_en_attente()
+
+    def _valider_en_attente(self):
+        self._planifie = None
+        for i in self._a_valider:
+            if i < len(self.magasin):
+                self.magasin.valider(i)
+                v = i - self.premiere
+                if 0 <= v < len(self.entries):
+                    self._peindre(v)
+        self._a_valider.clear()
+        if self.on_change:
+            self.on_change()
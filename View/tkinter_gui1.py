@@ -1,12 +1,19 @@
 import tkinter as tk
-from tkinter import messagebox
-from controleur.controller import lancer_script  # Ta fonction déplacée
+from tkinter import filedialog, messagebox
+from controleur.controller import collecter_lignes, importer_fichier  # Ta fonction déplacée
+from controleur.taches import TacheScraping
+from View.grille_virtuelle import HIGHLIGHT_BG, GrilleVirtuelle, MagasinLignes
 
-N_MAX = 50
-HIGHLIGHT_BG = '#ffcdd2'
+N_MAX = 100000
+DELAI_VALIDATION = 150  # ms sans frappe avant de revalider
+NB_WORKERS = 2
+INTERVALLE_SUIVI = 100  # ms entre deux lectures de la file de progression
+
+tache = None
+fournisseur_valide = None
+validation_planifiee = None
 
 def generer_lignes():
-    global rows
     # Validation du nombre
     try:
         nb = int(entry_nombre.get())
@@ -16,77 +23,121 @@ def generer_lignes():
         messagebox.showerror("Erreur", f"Entrez un entier entre 1 et {N_MAX}.")
         return
 
-    # Nettoyage de l'ancienne grille
-    for w in frame_lignes.winfo_children():
-        w.destroy()
-    rows = []
-
-    # Création de l'en-tête
-    headers = ["Référence", "Prix", "Quantité", "Poids"]
-    for j, h in enumerate(headers):
-        lbl = tk.Label(frame_lignes, text=h, font=('Arial', 10, 'bold'))
-        lbl.grid(row=0, column=j, padx=5, pady=2)
-
-    # Création des lignes
-    for i in range(1, nb+1):
-        row_entries = []
-        for j in range(4):
-            ent = tk.Entry(frame_lignes, width=15)
-            ent.grid(row=i, column=j, padx=5, pady=2)
-            ent.default_bg = ent.cget('bg')
-            ent.bind("<KeyRelease>", lambda e: validate_all())
-            row_entries.append(ent)
-        rows.append(row_entries)
+    # Lignes vides : toutes invalides, aucun champ surligné
+    magasin.redimensionner(nb)
+    grille.rafraichir()
+    validate_all()
 
+def importer_fichier_click():
+    """Remplit la grille avec les lignes valides d'un fichier fournisseur."""
+    chemin = filedialog.askopenfilename(
+        title="Fichier fournisseur",
+        filetypes=[("Fichiers fournisseur", "*.csv *.tsv *.txt *.xlsx *.xlsm"), ("Tous les fichiers", "*.*")],
+    )
+    if not chemin:
+        return
+    rapport = {}
+    try:
+        magasin.redimensionner(0)
+        for record in importer_fichier(entry_fournisseur.get().strip(), chemin, rapport=rapport):
+            magasin.ajouter((record['référence'], record['prix'], record['quantité'], record['poids']))
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Erreur", f"Import impossible : {str(e)}")
+    grille.rafraichir()
     validate_all()
+    invalides = rapport.get('invalides', [])
+    if invalides:
+        apercu = ", ".join(str(n) for n in invalides[:10]) + (" …" if len(invalides) > 10 else "")
+        messagebox.showwarning("Import", f"{len(invalides)} ligne(s) ignorée(s) : {apercu}")
 
-def validate_all():
-    """Valide le fournisseur + chaque ligne, gère la surbrillance et l'état du bouton."""
-    # 1) Validation du Fournisseur
+def valider_fournisseur():
+    global fournisseur_valide
     supp = entry_fournisseur.get().strip()
-    valid_supp = bool(supp) and len(supp) <= 100
-    if not valid_supp:
-        entry_fournisseur.configure(bg=HIGHLIGHT_BG)
-    else:
-        entry_fournisseur.configure(bg=entry_fournisseur.default_bg)
-
-    # 2) Validation des lignes
-    all_valid = valid_supp
-    for row in rows:
-        ref_str, prix_str, qte_str, poids_str = [e.get().strip() for e in row]
-
-        valid_ref   = bool(ref_str and ref_str.isalnum())
-        try:
-            float(prix_str)
-            valid_prix = True
-        except ValueError:
-            valid_prix = False
-        valid_qte   = qte_str.isdigit() and bool(qte_str)
-        try:
-            float(poids_str)
-            valid_poids = True
-        except ValueError:
-            valid_poids = False
-
-        # Surbrillance champs invalides (seulement s’ils sont non vides)
-        for ent, valid in zip(row, [valid_ref, valid_prix, valid_qte, valid_poids]):
-            if ent.get().strip() and not valid:
-                ent.configure(bg=HIGHLIGHT_BG)
-            else:
-                ent.configure(bg=ent.default_bg)
-
-        if not (valid_ref and valid_prix and valid_qte and valid_poids):
-            all_valid = False
-
-    # 3) Activation / désactivation du bouton
-    btn_import.config(state=('normal' if all_valid and rows else 'disabled'))
+    valide = bool(supp) and len(supp) <= 100
+    if valide != fournisseur_valide:
+        entry_fournisseur.configure(bg=entry_fournisseur.default_bg if valide else HIGHLIGHT_BG)
+    fournisseur_valide = valide
+
+def maj_bouton_import():
+    # (pas de nouveau lot tant qu'un lot tourne en arrière-plan)
+    actif = fournisseur_valide and len(magasin) and magasin.nb_invalides == 0 and tache is None
+    btn_import.config(state=('normal' if actif else 'disabled'))
+    lbl_lignes.config(text=f"{len(magasin)} ligne(s), {magasin.nb_invalides} invalide(s)")
+
+def planifier_validation_fournisseur():
+    """Anti-rebond : le fournisseur est revalidé quand la frappe marque une pause."""
+    global validation_planifiee
+    if validation_planifiee is not None:
+        root.after_cancel(validation_planifiee)
+    validation_planifiee = root.after(DELAI_VALIDATION, validate_fournisseur_et_bouton)
+
+def validate_fournisseur_et_bouton():
+    global validation_planifiee
+    validation_planifiee = None
+    valider_fournisseur()
+    maj_bouton_import()
+
+def validate_all():
+    """Valide le fournisseur et met à jour l'état du bouton (les lignes sont validées par le magasin)."""
+    valider_fournisseur()
+    maj_bouton_import()
 
 def on_lancer_click():
-    """Wrapper UI : appelle le contrôleur et notifie."""
+    """Wrapper UI : appelle le contrôleur puis lance le scraping en arrière-plan."""
+    global tache, validation_planifiee
+    # Une frappe de moins de DELAI_VALIDATION ms n'est pas encore validée : on le fait maintenant
+    if validation_planifiee is not None:
+        root.after_cancel(validation_planifiee)
+    grille.valider_maintenant()
+    validate_fournisseur_et_bouton()
+    if not fournisseur_valide or magasin.nb_invalides or tache is not None:
+        return
     fournisseur = entry_fournisseur.get().strip()
-    data = lancer_script(fournisseur, rows)
-    print("Données stockées pour le modèle :", data)
-    messagebox.showinfo("Import", "Les données sont stockées et prêtes pour le modèle.")
+    data = collecter_lignes(fournisseur, magasin.lignes())
+    print(f"Données stockées pour le modèle : {len(data)} enregistrement(s)")
+
+    tache = TacheScraping([d['référence'] for d in data], nb_workers=NB_WORKERS,
+                          fournisseur=fournisseur, lignes_fournisseur=data)
+    tache.demarrer()
+    btn_import.config(state='disabled')
+    btn_pause.config(state='normal', text="Pause")
+    btn_annuler.config(state='normal')
+    lbl_progression.config(text=f"0/{len(data)} référence(s)…")
+    root.after(INTERVALLE_SUIVI, suivre_tache)
+
+def suivre_tache():
+    """Lit les messages du thread de fond (jamais d'appel Tk hors du thread principal)."""
+    global tache
+    for type_message, infos in tache.lire_messages():
+        if type_message == 'progression':
+            eta = f"{infos['eta']:.0f} s" if infos['eta'] is not None else "?"
+            statut = "OK" if infos['product_data'] else "introuvable"
+            lbl_progression.config(text=(
+                f"{infos['faits']}/{infos['total']} — {infos['ref']} : {statut} — "
+                f"{infos['debit'] * 60:.1f} réf/min — reste ~{eta}"
+            ))
+        elif type_message == 'fin':
+            tache = None
+            btn_pause.config(state='disabled', text="Pause")
+            btn_annuler.config(state='disabled')
+            validate_all()
+            etat = "annulé" if infos['annule'] else "terminé"
+            lbl_progression.config(text=f"Lot {etat} : {infos['faits']}/{infos['total']} en {infos['duree']:.0f} s")
+            messagebox.showinfo("Scraping", f"Lot {etat} : {infos['faits']}/{infos['total']} référence(s) traitée(s).")
+            return
+    root.after(INTERVALLE_SUIVI, suivre_tache)
+
+def on_pause_click():
+    if tache.en_pause:
+        tache.reprendre()
+        btn_pause.config(text="Pause")
+    else:
+        tache.pause()
+        btn_pause.config(text="Reprendre")
+
+def on_annuler_click():
+    tache.annuler()
+    btn_annuler.config(state='disabled')
 
 # --- Construction de l'UI ---
 root = tk.Tk()
@@ -99,7 +150,7 @@ tk.Label(frame_fourn, text="Fournisseur :").grid(row=0, column=0)
 entry_fournisseur = tk.Entry(frame_fourn, width=30)
 entry_fournisseur.grid(row=0, column=1, padx=5)
 entry_fournisseur.default_bg = entry_fournisseur.cget('bg')
-entry_fournisseur.bind("<KeyRelease>", lambda e: validate_all())
+entry_fournisseur.bind("<KeyRelease>", lambda e: planifier_validation_fournisseur())
 
 # Nombre de produits
 frame_haut = tk.Frame(root, padx=10, pady=5)
@@ -108,17 +159,29 @@ tk.Label(frame_haut, text="Nombre de produits à traiter :").grid(row=0, column=
 entry_nombre = tk.Entry(frame_haut, width=5)
 entry_nombre.grid(row=0, column=1, padx=5)
 tk.Button(frame_haut, text="Générer", command=generer_lignes).grid(row=0, column=2)
+tk.Button(frame_haut, text="Importer un fichier…", command=importer_fichier_click).grid(row=0, column=3, padx=5)
 
-# Zone des lignes
-frame_lignes = tk.Frame(root, padx=10, pady=10)
-frame_lignes.pack(fill='both', expand=True)
-rows = []
+# Zone des lignes : seules les lignes visibles ont des widgets
+magasin = MagasinLignes()
+grille = GrilleVirtuelle(root, magasin, on_change=maj_bouton_import,
+                         delai_validation=DELAI_VALIDATION, padx=10, pady=10)
+grille.pack(fill='both', expand=True)
+lbl_lignes = tk.Label(root, text="", anchor='w', padx=10, fg='grey')
+lbl_lignes.pack(fill='x')
 
 # Bouton Lancer
 frame_bas = tk.Frame(root, pady=10)
 frame_bas.pack()
 btn_import = tk.Button(frame_bas, text="Lancer", state='disabled', command=on_lancer_click)
-btn_import.pack()
+btn_import.pack(side='left', padx=5)
+btn_pause = tk.Button(frame_bas, text="Pause", state='disabled', command=on_pause_click)
+btn_pause.pack(side='left', padx=5)
+btn_annuler = tk.Button(frame_bas, text="Annuler", state='disabled', command=on_annuler_click)
+btn_annuler.pack(side='left', padx=5)
+
+# Progression du lot en cours
+lbl_progression = tk.Label(root, text="", anchor='w', padx=10)
+lbl_progression.pack(fill='x', pady=(0, 10))
 
 # Initialisation de l'état
 validate_all()
@@ -0,0 +1,233 @@
+# bench/banc.py
+# Banc d'essai hors ligne : lance le faux deejay.de (bench/serveur.py), exécute
+# chaque moteur dans un processus à part (dossier de travail vierge, donc
+# caches froids) avec DEEJAY_URL pointant dessus, et compare refs/s, latence
+# par référence (p50/p95) et pic de mémoire (processus + Chrome).
+#
+#   python -m bench.banc                       # tous les moteurs
+#   python -m bench.banc scrap scrap_http      # une sélection
+#   python -m bench.banc --latence 0.2 --debit 2000000 --sortie bench.json
+#   python -m bench.banc scrap_http --mp3-dans-html  # chemin HTTP sans repli Selenium
+#   python -m bench.banc --comparer bench.json # échoue si un moteur régresse
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench.serveur import SELECTEUR_INTROUVABLE, SiteLocal
+from Model.commun import REFERENCES
+
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Nom -> arguments de python ; chaque moteur traite Model.commun.REFERENCES
+# (scrappbyurl : ses URL produit codées en dur, cf. ATTENDUES)
+MOTEURS = {
+    'scrap': ['-m', 'Model.scrap'],
+    'scrap_pool': ['-m', 'Model.scrap', '4'],
+    'scrappbyurl': ['-m', 'Model.scrappbyurl'],
+    'scrap_http': ['-m', 'Model.scrap_http'],
+    'pipeline': ['-m', 'Model.pipeline'],
+    'ordonnanceur': ['-m', 'Model.ordonnanceur'],
+}
+# Références traitées par un moteur qui ne prend pas REFERENCES (len(Model.scrappbyurl.PRODUITS))
+ATTENDUES = {'scrappbyurl': 1}
+
+
+def centile(valeurs, q):
+    """Centile au rang le plus proche (valeurs non vides)."""
+    valeurs = sorted(valeurs)
+    return valeurs[min(len(valeurs) - 1, max(0, round(q * len(valeurs)) - 1))]
+
+
+def _rss_arbre(pid):
+    """RSS cumulée (octets) de pid et de ses descendants (Chrome, chromedriver...)."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        try:
+            racine = psutil.Process(pid)
+            total = 0
+            for p in [racine] + racine.children(recursive=True):
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total
+        except psutil.Error:
+            return 0
+    if not os.path.isdir("/proc"):
+        return None
+    # Sans psutil : lecture directe de /proc (Linux)
+    parents = {}
+    for entree in os.listdir("/proc"):
+        if entree.isdigit():
+            try:
+                with open(f"/proc/{entree}/stat") as f:
+                    parents[int(entree)] = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                pass
+    arbre, a_voir = set(), [pid]
+    while a_voir:
+        courant = a_voir.pop()
+        arbre.add(courant)
+        a_voir.extend(p for p, parent in parents.items() if parent == courant and p not in arbre)
+    total = 0
+    for p in arbre:
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for ligne in f:
+                    if ligne.startswith("VmRSS:"):
+                        total += int(ligne.split()[1]) * 1024
+        except OSError:
+            pass
+    return total
+
+
+def executer_moteur(nom, site, delai_max=1800, periode=0.2):
+    """
+    Lance un moteur contre le site local et mesure son exécution. Il n'est
+    ok que s'il sort sans erreur après avoir traité toutes ses références
+    jusqu'aux MP3 (une extraction ratée ne compte pas).
+    Returns:
+        dict: moteur, ok, duree, references, completes, attendues, refs_par_s, p50, p95,
+        rss_max_mo, requetes
+    """
+    site.reinitialiser()
+    with tempfile.TemporaryDirectory(prefix=f"banc_{nom}_") as dossier:
+        env = dict(os.environ, DEEJAY_URL=site.url, DEEJAY_INTROUVABLE=SELECTEUR_INTROUVABLE,
+                   PYTHONPATH=RACINE, PYTHONUNBUFFERED="1")
+        journal = open(os.path.join(dossier, "sortie.log"), 'w')
+        debut = time.perf_counter()
+        processus = subprocess.Popen([sys.executable, *MOTEURS[nom]], cwd=dossier, env=env,
+                                     stdout=journal, stderr=subprocess.STDOUT)
+        pic = [0]
+
+        def echantillonner():
+            while processus.poll() is None:
+                rss = _rss_arbre(processus.pid)
+                if rss is None:
+                    return
+                pic[0] = max(pic[0], rss)
+                time.sleep(periode)
+
+        echantillonneur = threading.Thread(target=echantillonner, daemon=True)
+        echantillonneur.start()
+        try:
+            code = processus.wait(timeout=delai_max)
+        except subprocess.TimeoutExpired:
+            processus.kill()
+            code = processus.wait()
+        duree = time.perf_counter() - debut
+        echantillonneur.join()
+        journal.close()
+        if code != 0:
+            with open(os.path.join(dossier, "sortie.log"), encoding='utf-8', errors='replace') as f:
+                print(f"[{nom}] code de sortie {code}, fin du journal :\n{f.read()[-2000:]}")
+
+    latences = list(site.latences().values())
+    attendues = ATTENDUES.get(nom, len(REFERENCES))
+    completes = len(site.avec_mp3)
+    if code == 0 and completes != attendues:
+        print(f"[{nom}] {completes} référence(s) traitée(s) jusqu'aux MP3 sur {attendues}")
+    return {
+        'moteur': nom,
+        'ok': code == 0 and completes == attendues,
+        'duree': round(duree, 3),
+        'references': len(latences),
+        'completes': completes,
+        'attendues': attendues,
+        'refs_par_s': round(len(latences) / duree, 3) if duree else 0.0,
+        'p50': round(centile(latences, 0.50), 3) if latences else None,
+        'p95': round(centile(latences, 0.95), 3) if latences else None,
+        'rss_max_mo': round(pic[0] / 1e6, 1) if pic[0] else None,
+        'requetes': site.nb_requetes,
+    }
+
+
+def afficher(resultats):
+    print(f"\n{'Moteur':<14}{'ok':>4}{'durée (s)':>11}{'refs':>6}{'refs/s':>9}{'p50':>8}{'p95':>8}{'RSS max':>10}")
+    for r in resultats:
+        rss = f"{r['rss_max_mo']:.0f} Mo" if r['rss_max_mo'] else "n/a"
+        p50 = f"{r['p50']:.2f}" if r['p50'] is not None else "n/a"
+        p95 = f"{r['p95']:.2f}" if r['p95'] is not None else "n/a"
+        print(f"{r['moteur']:<14}{'oui' if r['ok'] else 'NON':>4}{r['duree']:>11.2f}{r['references']:>6}"
+              f"{r['refs_par_s']:>9.2f}{p50:>8}{p95:>8}{rss:>10}")
+
+
+def comparer(resultats, chemin, tolerance):
+    """
+    Compare aux mesures enregistrées dans chemin.
+    Returns:
+        list of str: moteurs en échec, ou dont le débit a baissé de plus de tolerance
+    """
+    with open(chemin, encoding='utf-8') as f:
+        anciens = {r['moteur']: r for r in json.load(f)['resultats']}
+    regressions = []
+    print(f"\nComparaison avec {chemin} :")
+    for r in resultats:
+        if not r['ok']:
+            print(f"  {r['moteur']:<14} en échec ({r['completes']}/{r['attendues']} références)")
+            regressions.append(r['moteur'])
+            continue
+        ancien = anciens.get(r['moteur'])
+        if not ancien or not ancien['refs_par_s']:
+            continue
+        rapport = r['refs_par_s'] / ancien['refs_par_s']
+        print(f"  {r['moteur']:<14} {ancien['refs_par_s']:.2f} -> {r['refs_par_s']:.2f} refs/s (x{rapport:.2f})")
+        if rapport < 1 - tolerance:
+            regressions.append(r['moteur'])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banc d'essai des moteurs de scraping sur un faux deejay.de local")
+    parser.add_argument('moteurs', nargs='*', help=f"moteurs à mesurer parmi {', '.join(MOTEURS)} (tous par défaut)")
+    parser.add_argument('--latence', type=float, default=0.05, help="délai par réponse (s)")
+    parser.add_argument('--debit', type=int, default=0, help="octets/s par réponse (0 = illimité)")
+    parser.add_argument('--pistes', type=int, default=4, help="pistes par produit")
+    parser.add_argument('--taille-mp3', type=int, default=400 * 1024)
+    parser.add_argument('--mp3-dans-html', action='store_true',
+                        help="URL des MP3 en clair dans la page (le vrai site ne le fait pas)")
+    parser.add_argument('--delai-max', type=int, default=1800, help="temps max par moteur (s)")
+    parser.add_argument('--sortie', help="fichier JSON où enregistrer les résultats")
+    parser.add_argument('--comparer', help="JSON d'un banc précédent ; code 1 si régression")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="baisse de refs/s tolérée")
+    args = parser.parse_args(argv)
+    inconnus = [m for m in args.moteurs if m not in MOTEURS]
+    if inconnus:
+        parser.error(f"moteur(s) inconnu(s) : {', '.join(inconnus)}")
+
+    site = SiteLocal(latence=args.latence, debit=args.debit, nb_pistes=args.pistes,
+                     taille_mp3=args.taille_mp3, mp3_dans_html=args.mp3_dans_html).demarrer()
+    print(f"Faux deejay.de sur {site.url} (latence {args.latence * 1000:.0f} ms, "
+          f"débit {args.debit or 'illimité'})")
+    resultats = []
+    try:
+        for nom in args.moteurs or list(MOTEURS):
+            print(f"-> {nom}")
+            resultats.append(executer_moteur(nom, site, args.delai_max))
+    finally:
+        site.shutdown()
+
+    afficher(resultats)
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            json.dump({'reglages': vars(args), 'resultats': resultats}, f, indent=2)
+    if args.comparer:
+        regressions = comparer(resultats, args.comparer, args.tolerance)
+        if regressions:
+            print(f"Régression : {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
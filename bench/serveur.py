@@ -0,0 +1,203 @@
+# bench/serveur.py
+# Faux deejay.de local pour le banc d'essai : accueil avec bannière cookies,
+# recherche avec iframe myIframe, pages produit article.single_product,
+# pochettes et MP3, à partir des gabarits de bench/fixtures. Comme sur le vrai
+# site, l'URL des MP3 n'est construite que par le lecteur JS au clic (sauf en
+# mode mp3_dans_html). Latence et débit réglables ; le serveur note la première et la dernière requête de chaque
+# référence pour en déduire sa latence de bout en bout.
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+import hashlib
+import os
+import threading
+import time
+import zlib
+
+
+DOSSIER_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PREFIXE_INTROUVABLE = "NONE"  # Une référence commençant ainsi n'a aucun résultat
+SELECTEUR_INTROUVABLE = "p.no-results"  # Marqueur de la page sans résultat (DEEJAY_INTROUVABLE)
+
+
+def charger_fixtures(dossier=DOSSIER_FIXTURES):
+    gabarits = {}
+    for nom in os.listdir(dossier):
+        if nom.endswith(".html"):
+            with open(os.path.join(dossier, nom), encoding='utf-8') as f:
+                gabarits[nom[:-5]] = Template(f.read())
+    return gabarits
+
+
+class SiteLocal(ThreadingHTTPServer):
+    """
+    Args:
+        latence (float): délai (s) avant chaque réponse
+        debit (int): octets/s par réponse ; 0 = illimité
+        nb_pistes (int): pistes par produit
+        taille_image / taille_mp3 (int): taille des fichiers servis (octets)
+        mp3_dans_html (bool): écrit aussi l'URL des MP3 dans la page (data-mp3),
+            pour mesurer le moteur HTTP sans son repli Selenium
+    """
+
+    daemon_threads = True
+
+    def __init__(self, adresse=('127.0.0.1', 0), latence=0.05, debit=0, nb_pistes=4,
+                 taille_image=60 * 1024, taille_mp3=400 * 1024, mp3_dans_html=False,
+                 dossier_fixtures=DOSSIER_FIXTURES):
+        super().__init__(adresse, _Gestionnaire)
+        self.latence = latence
+        self.debit = debit
+        self.nb_pistes = nb_pistes
+        self.taille_image = taille_image
+        self.taille_mp3 = taille_mp3
+        self.mp3_dans_html = mp3_dans_html
+        self.gabarits = charger_fixtures(dossier_fixtures)
+        self._verrou = threading.Lock()
+        self._slugs = {}  # slug -> référence
+        self.chronologie = {}  # référence (ou slug inconnu) -> [première, dernière requête]
+        self.avec_mp3 = set()  # Références dont au moins un MP3 a été demandé (traitées de bout en bout)
+        self.nb_requetes = 0
+
+    @property
+    def url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def slug(self, ref):
+        slug = f"Artist_{ref}_Vinyl__{zlib.crc32(ref.encode('utf-8')) % 10 ** 7}"
+        with self._verrou:
+            self._slugs[slug] = ref
+        return slug
+
+    def noter(self, cle):
+        maintenant = time.perf_counter()
+        with self._verrou:
+            self.nb_requetes += 1
+            cle = self._slugs.get(cle, cle)
+            if cle in self.chronologie:
+                self.chronologie[cle][1] = maintenant
+            else:
+                self.chronologie[cle] = [maintenant, maintenant]
+
+    def reinitialiser(self):
+        with self._verrou:
+            self.chronologie = {}
+            self.avec_mp3 = set()
+            self.nb_requetes = 0
+
+    def latences(self):
+        """Durée entre la première et la dernière requête de chaque référence (s)."""
+        with self._verrou:
+            return {cle: fin - debut for cle, (debut, fin) in self.chronologie.items()}
+
+    def demarrer(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Gestionnaire(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _page(self, gabarit, **valeurs):
+        self._envoyer(self.server.gabarits[gabarit].substitute(**valeurs).encode('utf-8'),
+                      "text/html; charset=utf-8")
+
+    def _envoyer(self, corps, type_contenu, etag=None):
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", type_contenu)
+        self.send_header("Content-Length", str(len(corps)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        debit = self.server.debit
+        if not debit:
+            self.wfile.write(corps)
+            return
+        # Débit limité : blocs de 1/20 s
+        bloc = max(1024, debit // 20)
+        for i in range(0, len(corps), bloc):
+            self.wfile.write(corps[i:i + bloc])
+            time.sleep(len(corps[i:i + bloc]) / debit)
+
+    def _produit(self, slug):
+        ref = self.server._slugs.get(slug, slug)
+        return {
+            'slug': slug,
+            'artist': f"Artist {ref}",
+            'title': f"Title {ref}",
+            'price': "12,99 €",
+        }
+
+    def do_GET(self):
+        time.sleep(self.server.latence)
+        morceaux = urlsplit(self.path)
+        chemin = unquote(morceaux.path)
+        params = parse_qs(morceaux.query)
+
+        if chemin == "/":
+            return self._page("accueil")
+
+        if chemin in ("/search", "/frame/search"):
+            query = params.get('q', [''])[0]
+            self.server.noter(query)
+            if chemin == "/search":
+                return self._page("recherche", query=query, query_url=quote(query))
+            if query and not query.startswith(PREFIXE_INTROUVABLE):
+                articles = self.server.gabarits["resultat_article"].substitute(**self._produit(self.server.slug(query)))
+                return self._page("resultats", articles=articles, aucun="")
+            return self._page("resultats", articles="", aucun='<p class="no-results">No results found.</p>')
+
+        if chemin.startswith("/frame/product/"):
+            slug = chemin[len("/frame/product/"):]
+            self.server.noter(slug)
+            produit = self._produit(slug)
+            covers = f'<img src="/media/l2/{slug}_1.jpg" alt="">'
+            pistes = "\n".join(
+                f'    <li><a href="play/{slug}/{i}"'
+                + (f' data-mp3="/media/mp3/{slug}_{i}.mp3"' if self.server.mp3_dans_html else '')
+                + f'>A{i}. Track {i}</a></li>'
+                for i in range(1, self.server.nb_pistes + 1)
+            )
+            return self._page("article", covers=covers, tracks=pistes,
+                              description=f"Fixture for {produit['artist']}", **produit)
+
+        if chemin.startswith("/media/"):
+            fichier = os.path.basename(chemin)
+            slug = fichier.rsplit("_", 1)[0]
+            self.server.noter(slug)
+            if fichier.endswith(".mp3"):
+                with self.server._verrou:
+                    self.server.avec_mp3.add(self.server._slugs.get(slug, slug))
+                taille, type_contenu = self.server.taille_mp3, "audio/mpeg"
+            else:
+                taille, type_contenu = self.server.taille_image, "image/jpeg"
+            # Contenu déterministe : même fichier, même ETag d'un lancement à l'autre
+            graine = hashlib.sha256(chemin.encode('utf-8')).digest()
+            corps = (graine * (taille // len(graine) + 1))[:taille]
+            return self._envoyer(corps, type_contenu, etag=f'"{graine.hex()[:16]}"')
+
+        if chemin.count("/") == 1 and "__" in chemin:
+            slug = chemin[1:]
+            self.server.noter(slug)
+            return self._page("produit", **self._produit(slug))
+
+        self.send_error(404)
+
+
+if __name__ == "__main__":
+    # python -m bench.serveur [port] : sert le faux site jusqu'à Ctrl+C
+    import sys
+
+    site = SiteLocal(('127.0.0.1', int(sys.argv[1]) if len(sys.argv) > 1 else 8765))
+    print(f"Faux deejay.de sur {site.url} (DEEJAY_URL={site.url})")
+    site.serve_forever()
@@ -1,5 +1,8 @@
 # controleur/controller.py
 
+import os
+import unicodedata
+
 _collected_data = None
 
 def lancer_script(fournisseur, rows):
@@ -11,15 +14,27 @@ def lancer_script(fournisseur, rows):
     Returns:
         list of dict: les enregistrements collectés
     """
+    return collecter_lignes(fournisseur, ([e.get() for e in row] for row in rows))
+
+def collecter_lignes(fournisseur, lignes):
+    """
+    Comme lancer_script, à partir des textes saisis plutôt que des widgets.
+    Args:
+        fournisseur (str): nom du fournisseur
+        lignes (iterable): (référence, prix, quantité, poids) en texte, par ex.
+            MagasinLignes.lignes() de la grille virtualisée
+    Returns:
+        list of dict: les enregistrements collectés
+    """
     global _collected_data
     data = []
-    for row in rows:
+    for ref, prix, qte, poids in lignes:
         data.append({
             'fournisseur': fournisseur,
-            'référence': row[0].get().strip(),
-            'prix':    float(row[1].get().strip()),
-            'quantité': int(row[2].get().strip()),
-            'poids':   float(row[3].get().strip())
+            'référence': ref.strip(),
+            'prix':    float(prix.strip()),
+            'quantité': int(qte.strip()),
+            'poids':   float(poids.strip())
         })
     _collected_data = data
     return data
@@ -27,3 +42,148 @@ def lancer_script(fournisseur, rows):
 def get_collected_data():
     """Renvoie les données stockées par le dernier appel à lancer_script."""
     return _collected_data
+
+
+# --- Import en masse des fichiers fournisseurs (CSV / TSV / XLSX) ---
+
+TAILLE_BLOC = 10000
+
+# En-têtes acceptés (sans accents, en minuscules) -> champ de l'enregistrement
+ALIAS_COLONNES = {
+    'reference': 'référence', 'ref': 'référence', 'référence': 'référence',
+    'prix': 'prix', 'price': 'prix',
+    'quantite': 'quantité', 'qte': 'quantité', 'qty': 'quantité', 'quantity': 'quantité',
+    'poids': 'poids', 'weight': 'poids',
+}
+CHAMPS = ['référence', 'prix', 'quantité', 'poids']
+
+
+def _normaliser_entete(entete):
+    texte = unicodedata.normalize('NFKD', str(entete).strip().lower())
+    texte = ''.join(c for c in texte if not unicodedata.combining(c))
+    return ALIAS_COLONNES.get(texte, texte)
+
+
+def _separateur(chemin):
+    """Devine le séparateur CSV d'après la ligne d'en-tête (Excel FR exporte en ';')."""
+    with open(chemin, encoding='utf-8-sig', errors='replace') as f:
+        entete = f.readline()
+    return max([';', ',', '\t'], key=entete.count)
+
+
+def _blocs_excel(chemin, taille_bloc):
+    """openpyxl en lecture seule : les lignes sont lues au fil de l'eau, bloc par bloc."""
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    classeur = load_workbook(chemin, read_only=True, data_only=True)
+    try:
+        lignes = classeur.active.iter_rows(values_only=True)
+        entetes = next(lignes, None)
+        if entetes is None:
+            return
+        bloc = []
+        for ligne in lignes:
+            bloc.append(ligne)
+            if len(bloc) >= taille_bloc:
+                yield pd.DataFrame(bloc, columns=entetes, dtype=str)
+                bloc = []
+        if bloc:
+            yield pd.DataFrame(bloc, columns=entetes, dtype=str)
+    finally:
+        classeur.close()
+
+
+def lire_par_blocs(chemin, taille_bloc=TAILLE_BLOC):
+    """
+    Lit un fichier fournisseur par blocs de taille_bloc lignes.
+    Yields:
+        pandas.DataFrame: colonnes 'référence', 'prix', 'quantité', 'poids' (texte brut)
+    """
+    import pandas as pd
+
+    extension = os.path.splitext(chemin)[1].lower()
+    if extension in ('.xlsx', '.xlsm'):
+        blocs = _blocs_excel(chemin, taille_bloc)
+    elif extension in ('.csv', '.tsv', '.txt'):
+        sep = '\t' if extension == '.tsv' else _separateur(chemin)
+        blocs = pd.read_csv(chemin, sep=sep, dtype=str, chunksize=taille_bloc,
+                            encoding='utf-8-sig', keep_default_na=False)
+    else:
+        raise ValueError(f"Format non pris en charge : {extension}")
+
+    for bloc in blocs:
+        bloc = bloc.rename(columns=_normaliser_entete)
+        manquants = [c for c in CHAMPS if c not in bloc.columns]
+        if manquants:
+            raise ValueError(f"Colonnes manquantes : {', '.join(manquants)}")
+        yield bloc[CHAMPS]
+
+
+def valider_bloc(bloc):
+    """
+    Validation vectorisée d'un bloc, mêmes règles que la saisie dans l'UI :
+    référence alphanumérique, prix et poids décimaux, quantité entière positive.
+    Returns:
+        tuple: (DataFrame des lignes valides typées, Series booléenne de validité)
+    """
+    import pandas as pd
+
+    def nombre(colonne):
+        texte = bloc[colonne].fillna('').astype(str).str.strip().str.replace(',', '.', regex=False)
+        return pd.to_numeric(texte, errors='coerce')
+
+    ref = bloc['référence'].fillna('').astype(str).str.strip()
+    prix = nombre('prix')
+    poids = nombre('poids')
+    qte_texte = bloc['quantité'].fillna('').astype(str).str.strip()
+    valide = (
+        ref.str.fullmatch(r'[^\W_]+')
+        & prix.notna()
+        & poids.notna()
+        & qte_texte.str.fullmatch(r'\d+')
+    ).fillna(False).astype(bool)
+
+    valides = pd.DataFrame({
+        'référence': ref[valide],
+        'prix': prix[valide].astype(float),
+        'quantité': qte_texte[valide].astype('int64'),
+        'poids': poids[valide].astype(float),
+    })
+    return valides, valide
+
+
+def importer_fichier(fournisseur, chemin, taille_bloc=TAILLE_BLOC, rapport=None):
+    """
+    Importe un fichier fournisseur sans le charger en entier : les
+    enregistrements sont produits à la demande, bloc par bloc.
+    Args:
+        fournisseur (str): nom du fournisseur
+        chemin (str): fichier .csv, .tsv ou .xlsx avec une ligne d'en-tête
+        rapport (dict): si fourni, mis à jour avec 'lues', 'valides' et
+            'invalides' (numéros de ligne du fichier, en-tête = ligne 1)
+    Yields:
+        dict: enregistrement au même format que lancer_script
+    """
+    if rapport is not None:
+        rapport.setdefault('lues', 0)
+        rapport.setdefault('valides', 0)
+        rapport.setdefault('invalides', [])
+
+    debut_bloc = 2
+    for bloc in lire_par_blocs(chemin, taille_bloc):
+        valides, valide = valider_bloc(bloc)
+        if rapport is not None:
+            rapport['lues'] += len(bloc)
+            rapport['valides'] += len(valides)
+            rapport['invalides'].extend(debut_bloc + int(i) for i in (~valide.to_numpy()).nonzero()[0])
+        debut_bloc += len(bloc)
+
+        for ref, prix, qte, poids in valides.itertuples(index=False, name=None):
+            yield {
+                'fournisseur': fournisseur,
+                'référence': ref,
+                'prix': prix,
+                'quantité': int(qte),
+                'poids': poids,
+            }
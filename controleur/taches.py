@@ -0,0 +1,189 @@
+# controleur/taches.py
+# Exécution des lots de scraping hors du thread Tk : la GUI lit les messages
+# de progression dans une file (root.after) et peut mettre en pause ou annuler.
+
+import queue
+import threading
+import time
+
+
+class TacheScraping:
+    """
+    Traite une liste de références dans des threads de fond.
+    Messages déposés dans self.messages (tuples) :
+        ('progression', infos)  après chaque référence, infos étant un dict
+            (ref, product_url, product_data, faits, total, debit, eta)
+        ('fin', infos)          lot terminé ou annulé (faits, total, annule, duree)
+    """
+
+    def __init__(self, references, nb_workers=1, creer_traitement=None, fournisseur=None,
+                 lignes_fournisseur=None):
+        """
+        Args:
+            references (list of str): références à traiter
+            nb_workers (int): nombre de Chrome en parallèle
+            creer_traitement (callable): renvoie (traiter(ref), fermer()) pour
+                un worker ; par défaut une connexion au démon (Model.demon) s'il
+                écoute, sinon un Chrome du modèle Model.scrap
+            fournisseur (str): fournisseur du lot, enregistré avec chaque fiche
+            lignes_fournisseur (list of dict): enregistrements du contrôleur,
+                stockés avec les fiches (Model.resultats) pour les jointures
+        """
+        self.references = list(references)
+        self.fournisseur = fournisseur
+        self.lignes_fournisseur = lignes_fournisseur or []
+        self.nb_workers = max(1, min(nb_workers, len(self.references) or 1))
+        self.messages = queue.Queue()
+        self.resultats = [None] * len(self.references)
+        self._creer_traitement = creer_traitement
+        self._a_faire = queue.Queue()
+        self._annulee = threading.Event()
+        self._en_marche = threading.Event()
+        self._en_marche.set()
+        self._verrou = threading.Lock()
+        self._faits = 0
+        self._debut = None
+        self._ressources = None
+        self._resultats = None
+
+    # --- Commandes depuis la GUI ---
+
+    def demarrer(self):
+        for index, ref in enumerate(self.references):
+            self._a_faire.put((index, ref))
+        self._debut = time.perf_counter()
+        threading.Thread(target=self._superviser, daemon=True).start()
+
+    def pause(self):
+        self._en_marche.clear()
+
+    def reprendre(self):
+        self._en_marche.set()
+
+    def annuler(self):
+        """La référence en cours se termine, les suivantes ne sont pas lancées."""
+        self._annulee.set()
+        self._en_marche.set()
+
+    @property
+    def en_pause(self):
+        return not self._en_marche.is_set()
+
+    def lire_messages(self):
+        """Vide la file sans bloquer (à appeler depuis root.after)."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    # --- Threads de fond ---
+
+    def _traitement_modele(self):
+        """Un Chrome par worker, cache de recherche et téléchargements partagés."""
+        from Model.scrap import traiter_reference
+        from Model.session_navigateur import EtatSession
+
+        fabrique, cache, telechargements = self._ressources
+        driver = fabrique.obtenir()
+        session = EtatSession()
+
+        def traiter(ref):
+            return traiter_reference(driver, ref, telechargements, cache, session)
+
+        return traiter, lambda: fabrique.rendre(driver)
+
+    def _traitement_demon(self):
+        """Une connexion au démon par worker : ses Chrome sont déjà démarrés."""
+        from Model.demon import ClientDemon
+
+        client = ClientDemon()
+
+        def traiter(ref):
+            return client.traiter([ref])[0]
+
+        return traiter, client.fermer
+
+    def _superviser(self):
+        if self._creer_traitement is None:
+            from Model.demon import demon_disponible
+            from Model.resultats import ResultatsSQLite
+
+            if demon_disponible():
+                self._creer_traitement = self._traitement_demon
+            else:
+                from Model.cache_recherche import CacheRecherche
+                from Model.pilotes import FabriquePilotes
+                from Model.telechargement import GestionnaireTelechargements
+
+                self._ressources = (FabriquePilotes(reserve=False), CacheRecherche(), GestionnaireTelechargements())
+                self._creer_traitement = self._traitement_modele
+            self._resultats = ResultatsSQLite()
+            self._resultats.enregistrer_lignes_fournisseur(self.lignes_fournisseur)
+
+        workers = [threading.Thread(target=self._travailler, daemon=True) for _ in range(self.nb_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+        if self._ressources is not None:
+            fabrique, cache, telechargements = self._ressources
+            telechargements.fermer()
+            cache.sauvegarder()
+            fabrique.fermer()
+        if self._resultats is not None:
+            self._resultats.fermer()
+
+        self.messages.put(('fin', {
+            'faits': self._faits,
+            'total': len(self.references),
+            'annule': self._annulee.is_set(),
+            'duree': time.perf_counter() - self._debut,
+        }))
+
+    def _travailler(self):
+        try:
+            traiter, fermer = self._creer_traitement()
+        except Exception as e:
+            print(f"Démarrage du worker impossible : {str(e)}")
+            return
+        try:
+            while True:
+                self._en_marche.wait()
+                if self._annulee.is_set():
+                    return
+                try:
+                    index, ref = self._a_faire.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    product_url, product_data = traiter(ref)
+                except Exception as e:
+                    print(f"Erreur sur {ref}: {str(e)}")
+                    product_url, product_data = None, None
+                self.resultats[index] = (product_url, product_data)
+                if self._resultats is not None:
+                    self._resultats.ajouter(ref, product_data, self.fournisseur)
+                self._signaler(ref, product_url, product_data)
+        finally:
+            fermer()
+
+    def _signaler(self, ref, product_url, product_data):
+        with self._verrou:
+            self._faits += 1
+            faits = self._faits
+        ecoule = time.perf_counter() - self._debut
+        debit = faits / ecoule if ecoule > 0 else 0.0
+        restant = len(self.references) - faits
+        self.messages.put(('progression', {
+            'ref': ref,
+            'product_url': product_url,
+            'product_data': product_data,
+            'faits': faits,
+            'total': len(self.references),
+            'debit': debit,
+            'eta': restant / debit if debit else None,
+        }))